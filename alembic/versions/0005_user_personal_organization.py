@@ -0,0 +1,39 @@
+"""users.personal_organization_id (fast path du login)
+
+Revision ID: 0005_user_personal_organization
+Revises: 0004_organizations_foundation
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_user_personal_organization"
+down_revision = "0004_organizations_foundation"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("personal_organization_id", sa.String(length=36), nullable=True))
+
+    # Backfill: l'org perso créée par 0004 (ou à l'inscription) de chaque utilisateur
+    op.execute(
+        """
+        UPDATE users SET personal_organization_id = (
+            SELECT o.id
+            FROM organizations o
+            JOIN organization_users ou ON ou.organization_id = o.id
+            WHERE ou.user_id = users.id AND o.org_type = 'personal'
+            ORDER BY o.created_at
+            LIMIT 1
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("personal_organization_id")
@@ -0,0 +1,34 @@
+"""index de purge sur refresh_tokens: expires_at et index partiel des révoqués
+
+Revision ID: 0006_refresh_token_indexes
+Revises: 0005_user_personal_organization
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_refresh_token_indexes"
+down_revision = "0005_user_personal_organization"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (ix_refresh_tokens_user_id existe depuis 0001: révocation de tous les tokens d'un user)
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"], unique=False)
+    # Partiel: seuls les tokens révoqués, seule population parcourue par created_at
+    op.create_index(
+        "ix_refresh_tokens_revoked_created_at",
+        "refresh_tokens",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("is_revoked"),
+        sqlite_where=sa.text("is_revoked"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_tokens_revoked_created_at", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
@@ -0,0 +1,30 @@
+"""refresh_tokens.family_id (rotation avec détection de rejeu)
+
+Revision ID: 0007_refresh_token_families
+Revises: 0006_refresh_token_indexes
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_refresh_token_families"
+down_revision = "0006_refresh_token_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.add_column(sa.Column("family_id", sa.String(length=36), nullable=True))
+        batch_op.create_index("ix_refresh_tokens_family_id", ["family_id"], unique=False)
+
+    # Tokens existants: chacun forme sa propre famille
+    op.execute("UPDATE refresh_tokens SET family_id = 'legacy-' || id WHERE family_id IS NULL")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.drop_index("ix_refresh_tokens_family_id")
+        batch_op.drop_column("family_id")
@@ -0,0 +1,29 @@
+"""table cache_versions (invalidation du cache des rôles)
+
+Revision ID: 0008_cache_versions
+Revises: 0007_refresh_token_families
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008_cache_versions"
+down_revision = "0007_refresh_token_families"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cache_versions",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute("INSERT INTO cache_versions (name, version) VALUES ('roles', 1)")
+
+
+def downgrade() -> None:
+    op.drop_table("cache_versions")
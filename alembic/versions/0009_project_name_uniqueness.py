@@ -0,0 +1,67 @@
+"""unicité (organization_id, name) des projets + compteur de noms par défaut
+
+Revision ID: 0009_project_name_uniqueness
+Revises: 0008_cache_versions
+Create Date: 2026-10-17
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0009_project_name_uniqueness"
+down_revision = "0008_cache_versions"
+branch_labels = None
+depends_on = None
+
+_DEFAULT_NAME = re.compile(r"^projet(?:_(\d+))?$")
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("organizations") as batch_op:
+        batch_op.add_column(sa.Column("project_name_seq", sa.Integer(), nullable=False, server_default="0"))
+
+    connection = op.get_bind()
+
+    # Doublons existants dans une même organisation: suffixés par le début de l'id
+    connection.execute(
+        sa.text(
+            """
+            UPDATE projects SET name = name || ' (' || substr(id, 1, 8) || ')'
+            WHERE EXISTS (
+                SELECT 1 FROM projects q
+                WHERE q.organization_id = projects.organization_id
+                  AND q.name = projects.name
+                  AND q.id < projects.id
+            )
+            """
+        )
+    )
+
+    # Compteur = plus grand suffixe par défaut déjà utilisé dans l'organisation
+    seq_by_org: dict[str, int] = {}
+    rows = connection.execute(
+        sa.text("SELECT organization_id, name FROM projects WHERE organization_id IS NOT NULL AND name LIKE 'projet%'")
+    ).fetchall()
+    for organization_id, name in rows:
+        match = _DEFAULT_NAME.match(name)
+        if match:
+            seq = int(match.group(1) or 1)
+            seq_by_org[organization_id] = max(seq_by_org.get(organization_id, 0), seq)
+    for organization_id, seq in seq_by_org.items():
+        connection.execute(
+            sa.text("UPDATE organizations SET project_name_seq = :seq WHERE id = :id"),
+            {"seq": seq, "id": organization_id},
+        )
+
+    with op.batch_alter_table("projects") as batch_op:
+        batch_op.create_unique_constraint("uq_project_organization_name", ["organization_id", "name"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("projects") as batch_op:
+        batch_op.drop_constraint("uq_project_organization_name", type_="unique")
+    with op.batch_alter_table("organizations") as batch_op:
+        batch_op.drop_column("project_name_seq")
@@ -0,0 +1,34 @@
+"""suppression de l'index partiel des refresh tokens révoqués
+
+Les tokens révoqués sont désormais conservés jusqu'à leur expiration (détection
+de rejeu pendant toute la validité du JWT): la purge ne filtre plus que sur
+`expires_at`, l'index partiel sur `created_at` n'est plus utilisé.
+
+Revision ID: 0010_drop_revoked_refresh_token_index
+Revises: 0009_project_name_uniqueness
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0010_drop_revoked_refresh_token_index"
+down_revision = "0009_project_name_uniqueness"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_refresh_tokens_revoked_created_at", table_name="refresh_tokens")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_refresh_tokens_revoked_created_at",
+        "refresh_tokens",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("is_revoked"),
+        sqlite_where=sa.text("is_revoked"),
+    )
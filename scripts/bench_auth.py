@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks du service auth (en process, via ASGITransport).
+
+Usage:
+    PYTHONPATH=src python scripts/bench_auth.py concurrency --requests 400 --concurrency 32 --db-latency-ms 5
+    PYTHONPATH=src python scripts/bench_auth.py signup --requests 200 --concurrency 8
+    PYTHONPATH=src python scripts/bench_auth.py ratelimit --iterations 200000
+
+`--db-latency-ms` ajoute une latence artificielle à chaque requête SQL pour
+simuler une base distante (Postgres): c'est là que le fait de ne plus bloquer
+la boucle d'événements se voit.
+"""
+
+import argparse
+import asyncio
+import os
+import secrets
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Base SQLite jetable et secret JWT avant tout import de projet.*
+_tmpdir = tempfile.mkdtemp(prefix="bench-auth-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+os.environ.setdefault("SECRET_KEY", secrets.token_hex(32))
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from projet.auth import models, security  # noqa: E402
+from projet.auth.app import app  # noqa: E402
+from projet.auth.database import Base, SessionLocal, engine  # noqa: E402
+
+
+def _seed_user(email: str = "bench@example.com") -> str:
+    """Crée un utilisateur (+ org perso) et retourne un token d'accès."""
+    from projet.auth.routers.auth import ensure_personal_organization
+
+    db = SessionLocal()
+    try:
+        u = models.User(email=email, hashed_password=security.hash_password("Bench123!"), is_verified=True)
+        db.add(u)
+        db.commit()
+        db.refresh(u)
+        ensure_personal_organization(db, u)
+        db.commit()
+        return security.create_access_token(str(u.id), roles=[], email=u.email)
+    finally:
+        db.close()
+
+
+def _install_db_latency(latency_ms: float) -> dict:
+    counter = {"queries": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _slow(conn, cursor, statement, parameters, context, executemany):
+        counter["queries"] += 1
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    return counter
+
+
+async def _run_load(path: str, headers: dict, total: int, concurrency: int, make_body=None) -> list[float]:
+    """GET `path` (ou POST du JSON `make_body(i)`) `total` fois avec `concurrency` workers."""
+    latencies: list[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while not queue.empty():
+                i = queue.get_nowait()
+                start = time.perf_counter()
+                if make_body is None:
+                    r = await client.get(path, headers=headers)
+                else:
+                    r = await client.post(path, headers=headers, json=make_body(i))
+                latencies.append((time.perf_counter() - start) * 1000)
+                r.raise_for_status()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label}: {len(latencies) / elapsed:8.1f} req/s  "
+        f"p50={statistics.median(latencies):6.1f} ms  p95={p95:6.1f} ms"
+    )
+
+
+def bench_concurrency(args) -> None:
+    Base.metadata.create_all(bind=engine)
+    token = _seed_user()
+    counter = _install_db_latency(args.db_latency_ms)
+    headers = {"Authorization": f"Bearer {token}"}
+    path = "/auth/context"
+
+    # Requêtes SQL par appel (pour le plafond théorique d'une boucle bloquée)
+    asyncio.run(_run_load(path, headers, 1, 1))
+    queries = max(counter["queries"], 1)
+    counter["queries"] = 0
+
+    for concurrency in (1, args.concurrency):
+        start = time.perf_counter()
+        latencies = asyncio.run(_run_load(path, headers, args.requests, concurrency))
+        _report(f"GET {path} concurrency={concurrency:<3}", latencies, time.perf_counter() - start)
+
+    if args.db_latency_ms:
+        ceiling = 1000 / (args.db_latency_ms * queries)
+        print(f"{queries} requêtes SQL/appel; plafond d'une boucle bloquée par la DB: {ceiling:.1f} req/s")
+
+
+def bench_signup(args) -> None:
+    Base.metadata.create_all(bind=engine)
+    if args.cheap_hash:
+        # Isole le coût DB de l'inscription (argon2 domine sinon le temps de réponse)
+        from passlib.context import CryptContext
+
+        security.pwd_context = CryptContext(schemes=["plaintext"])
+    commits = {"count": 0}
+
+    @event.listens_for(engine, "commit")
+    def _count_commit(conn):
+        commits["count"] += 1
+
+    counter = _install_db_latency(args.db_latency_ms)
+    run_id = secrets.token_hex(4)
+
+    def body(i: int) -> dict:
+        return {"email": f"signup-{run_id}-{i}@example.com", "password": "Bench123!"}
+
+    start = time.perf_counter()
+    latencies = asyncio.run(_run_load("/auth/register", {}, args.requests, args.concurrency, make_body=body))
+    _report(f"POST /auth/register concurrency={args.concurrency:<3}", latencies, time.perf_counter() - start)
+    print(
+        f"{commits['count'] / args.requests:.1f} commits/inscription, "
+        f"{counter['queries'] / args.requests:.1f} requêtes SQL/inscription"
+    )
+
+
+def bench_ratelimit(args) -> None:
+    """Coût par requête du rate limiter local (sans Redis)."""
+    from starlette.requests import Request
+
+    from projet.auth.ratelimit import AuthRateLimiter, Limit, LocalTokenBuckets
+
+    limit = Limit(10**9, 1)  # jamais atteinte: on mesure le chemin nominal
+    buckets = LocalTokenBuckets(shards=16, max_keys=100_000)
+    keys = [f"ratelimit:login:ip:10.0.{i // 256}.{i % 256}" for i in range(args.keys)]
+
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        buckets.hit(keys[i % len(keys)], limit)
+    per_hit = (time.perf_counter() - start) / args.iterations * 1e6
+    print(f"LocalTokenBuckets.hit: {per_hit:.2f} µs/appel ({args.keys} clés)")
+
+    limiter = AuthRateLimiter(enabled=True, rules={"login": (limit, limit)}, local=buckets)
+    requests = [Request({"type": "http", "client": (k.rsplit(":", 1)[1], 0), "headers": []}) for k in keys[:1000]]
+
+    async def run() -> float:
+        start = time.perf_counter()
+        for i in range(args.iterations):
+            await limiter.check_ip(requests[i % len(requests)], "login")
+            await limiter.check_account("login", "bench@example.com")
+        return (time.perf_counter() - start) / args.iterations * 1e6
+
+    print(f"check_ip + check_account: {asyncio.run(run()):.2f} µs/requête")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("concurrency", help="Débit de /auth/context sous requêtes concurrentes")
+    p.add_argument("--requests", type=int, default=400)
+    p.add_argument("--concurrency", type=int, default=32)
+    p.add_argument("--db-latency-ms", type=float, default=5.0)
+    p.set_defaults(func=bench_concurrency)
+
+    p = sub.add_parser("signup", help="Débit de /auth/register (transactions par inscription)")
+    p.add_argument("--requests", type=int, default=200)
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--db-latency-ms", type=float, default=0.0)
+    p.add_argument("--cheap-hash", action="store_true", help="Remplace argon2 par un hachage trivial")
+    p.set_defaults(func=bench_signup)
+
+    p = sub.add_parser("ratelimit", help="Surcoût par requête du rate limiter local")
+    p.add_argument("--iterations", type=int, default=200_000)
+    p.add_argument("--keys", type=int, default=10_000)
+    p.set_defaults(func=bench_ratelimit)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
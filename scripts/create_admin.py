@@ -18,7 +18,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
 from projet.auth.database import SessionLocal
-from projet.auth import models, security
+from projet.auth import models, roles, security
 
 
 def create_admin_user(email: str, password: str, first_name: str = None, last_name: str = None):
@@ -37,6 +37,7 @@ def create_admin_user(email: str, password: str, first_name: str = None, last_na
             print("⚠️  Le rôle 'admin' n'existe pas. Création...")
             admin_role = models.Role(name="admin")
             db.add(admin_role)
+            roles.bump_version(db)  # invalide le cache des rôles des services
             db.commit()
             db.refresh(admin_role)
             print("✅ Rôle 'admin' créé")
@@ -46,6 +47,7 @@ def create_admin_user(email: str, password: str, first_name: str = None, last_na
             print("⚠️  Le rôle 'user' n'existe pas. Création...")
             user_role = models.Role(name="user")
             db.add(user_role)
+            roles.bump_version(db)  # invalide le cache des rôles des services
             db.commit()
             db.refresh(user_role)
             print("✅ Rôle 'user' créé")
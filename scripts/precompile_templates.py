@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Précompile les templates Jinja de l'app web dans le cache de bytecode.
+
+Usage:
+    python scripts/precompile_templates.py --cache-dir /app/.jinja-cache
+
+À lancer au build de l'image (voir infra/docker/Dockerfile.app) avec le même
+WEB_TEMPLATE_CACHE_DIR que l'app: au premier rendu après un déploiement, les
+workers chargent le bytecode au lieu de compiler les templates.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from projet.app.templating import build_templates, precompile_templates
+from projet.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Précompiler les templates Jinja de l'app web")
+    parser.add_argument("--cache-dir", default=settings.WEB_TEMPLATE_CACHE_DIR, help="Défaut: WEB_TEMPLATE_CACHE_DIR")
+    args = parser.parse_args()
+    if not args.cache_dir:
+        parser.error("--cache-dir ou WEB_TEMPLATE_CACHE_DIR requis")
+
+    templates = build_templates(
+        str(project_root / "src" / "projet" / "app" / "templates"),
+        bytecode_cache_dir=args.cache_dir,
+    )
+    count = precompile_templates(templates)
+    print(f"✅ {count} template(s) compilé(s) dans {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
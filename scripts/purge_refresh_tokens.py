@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Supprime les refresh tokens expirés.
+
+Usage:
+    python scripts/purge_refresh_tokens.py
+    python scripts/purge_refresh_tokens.py --batch-size 500
+
+À lancer périodiquement (cron, CronJob k8s) ou via REFRESH_TOKEN_PURGE_INTERVAL
+dans le service auth.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from projet.auth.token_maintenance import purge_refresh_tokens
+from projet.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Purger les refresh tokens expirés")
+    parser.add_argument("--batch-size", type=int, default=settings.REFRESH_TOKEN_PURGE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None, help="Arrêter après N lots")
+    args = parser.parse_args()
+
+    deleted = purge_refresh_tokens(
+        batch_size=args.batch_size,
+        max_batches=args.max_batches,
+    )
+    print(f"✅ {deleted} refresh token(s) supprimé(s)")
+
+
+if __name__ == "__main__":
+    main()
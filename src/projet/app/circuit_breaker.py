@@ -0,0 +1,140 @@
+"""Circuit breaker par route amont (appels de l'app web vers le service auth).
+
+Une route est identifiée par la méthode et le chemin, les identifiants
+(entiers, UUID) remplacés par `{id}`: `GET /auth/projects/{id}`. Après
+`failure_threshold` échecs consécutifs (erreur réseau, timeout, réponse 5xx
+ou appel plus lent que `slow_call_ms`), le circuit s'ouvre: les appels
+échouent aussitôt avec `CircuitOpenError` pendant `reset_timeout` secondes.
+Ensuite un seul appel de test passe (semi-ouvert): succès -> fermé, échec ->
+ouvert à nouveau.
+
+Les routes de `slow_call_exempt` (connexion, inscription... qui hachent un
+mot de passe côté auth) ne comptent pas la lenteur comme un échec: sous
+charge, la file de hachage argon2 (`auth/hashing.py`) les rend légitimement
+lentes.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$")
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Circuit ouvert: l'appel n'a pas été émis.
+
+    Sous-classe de `httpx.TransportError`: les `except httpx.HTTPError` des
+    pages traitent ce cas comme un service auth indisponible.
+    """
+
+
+def route_key(method: str, url: str) -> str:
+    path = urlsplit(str(url)).path or "/"
+    segments = ["{id}" if _ID_SEGMENT.match(s) else s for s in path.split("/")]
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, slow_call_ms: float, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.slow_call_ms = slow_call_ms
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    def before_call(self) -> bool:
+        """Réserve l'appel; retourne True s'il s'agit de l'appel de test (semi-ouvert).
+
+        Lève `CircuitOpenError` si l'appel doit échouer tout de suite.
+        """
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return False
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError("Circuit ouvert vers le service auth")
+
+    def record(self, success: bool, probe: bool = False) -> None:
+        if probe:
+            self._probing = False
+        if success:
+            self.failures = 0
+            if self.state != CLOSED:
+                self.state = CLOSED
+            return
+        self.failures += 1
+        if probe or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            self.opened += 1
+
+    def release(self, probe: bool) -> None:
+        """Appel annulé sans résultat: libère la place de l'appel de test."""
+        if probe:
+            self._probing = False
+
+    def is_slow(self, elapsed_ms: float) -> bool:
+        return self.slow_call_ms > 0 and elapsed_ms > self.slow_call_ms
+
+
+class CircuitBreakers:
+    """Un `CircuitBreaker` par route, créé au premier appel (désactivé si `failure_threshold` <= 0)."""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        slow_call_ms: float,
+        reset_timeout: float,
+        slow_call_exempt: tuple[str, ...] = (),
+    ):
+        self.failure_threshold = failure_threshold
+        self.slow_call_ms = slow_call_ms
+        self.reset_timeout = reset_timeout
+        self.slow_call_exempt = frozenset(slow_call_exempt)
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    def get(self, route: str) -> CircuitBreaker | None:
+        if not self.enabled:
+            return None
+        breaker = self._breakers.get(route)
+        if breaker is None:
+            slow_call_ms = 0 if route in self.slow_call_exempt else self.slow_call_ms
+            breaker = self._breakers[route] = CircuitBreaker(
+                self.failure_threshold, slow_call_ms, self.reset_timeout
+            )
+        return breaker
+
+    def record(self, route: str, breaker: CircuitBreaker, success: bool, probe: bool) -> None:
+        previous = breaker.state
+        breaker.record(success, probe)
+        if breaker.state != previous:
+            log = logger.info if breaker.state == CLOSED else logger.warning
+            log("Circuit %s: %s -> %s", route, previous, breaker.state)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "open": sorted(r for r, b in self._breakers.items() if b.state != CLOSED),
+            "opened": sum(b.opened for b in self._breakers.values()),
+            "rejected": sum(b.rejected for b in self._breakers.values()),
+        }
@@ -0,0 +1,252 @@
+"""Client HTTP de l'app web vers le service auth: pool réglable, cycle de vie, métriques."""
+from __future__ import annotations
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from projet.app.circuit_breaker import CLOSED, CircuitBreakers, route_key
+
+
+class _Timing:
+    __slots__ = ("count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def stats(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / (self.count or 1), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class UpstreamClient:
+    """`httpx.AsyncClient` partagé, construit au démarrage de l'app et fermé à l'arrêt.
+
+    Même interface que le client httpx pour ce qu'utilise l'app (`get`, `post`,
+    `patch`, `put`, `delete`). Chaque requête est tracée (extension `trace`
+    d'httpcore) pour mesurer:
+    - l'attente d'une connexion du pool (jusqu'au premier évènement de la
+      connexion: ouverture TCP ou envoi des en-têtes);
+    - la durée d'ouverture des nouvelles connexions;
+    - le nombre de requêtes en vol, à comparer à `max_connections`.
+
+    Chaque route passe par un circuit breaker (`circuit_breaker.py`). Les GET
+    dont le chemin figure dans `hedge_paths` sont doublés si la réponse
+    n'est pas arrivée après `hedge_delay_ms`: la première réponse gagne,
+    l'autre appel est annulé. Pas de doublon quand le pool est plein ou que
+    le circuit de la route n'est pas fermé.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float,
+        connect_timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        http2: bool = False,
+        uds: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        breakers: CircuitBreakers | None = None,
+        hedge_delay_ms: float = 0,
+        hedge_paths: tuple[str, ...] = (),
+    ):
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.uds = uds or None
+        self._transport = transport  # tests: httpx.MockTransport
+        self._client: httpx.AsyncClient | None = None
+        self.breakers = breakers or CircuitBreakers(failure_threshold=0, slow_call_ms=0, reset_timeout=0)
+        self.hedge_delay_ms = hedge_delay_ms
+        self.hedge_paths = frozenset(hedge_paths)
+
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.saturated = 0  # requêtes émises alors que toutes les connexions étaient prises
+        self.pool_wait = _Timing()
+        self.connect = _Timing()
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def _build(self) -> httpx.AsyncClient:
+        transport = self._transport
+        if transport is None:
+            if self.http2:
+                try:
+                    import h2  # noqa: F401
+                except ImportError as e:
+                    raise RuntimeError("WEB_UPSTREAM_HTTP2=1 nécessite le paquet `httpx[http2]`") from e
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                http2=self.http2,
+                uds=self.uds,
+            )
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+        )
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = self._build()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Construit à la demande si l'app tourne sans évènement de démarrage (scripts, tests)
+        if self._client is None:
+            self._client = self._build()
+        return self._client
+
+    def _tracer(self, started: float):
+        first_event: list[float] = []
+        connect_started: list[float] = []
+
+        async def trace(name: str, info: dict) -> None:
+            now = time.perf_counter()
+            if not first_event:
+                first_event.append(now)
+                self.pool_wait.observe((now - started) * 1000)
+            if name in ("connection.connect_tcp.started", "connection.connect_unix_socket.started"):
+                connect_started.append(now)
+            elif name in ("connection.connect_tcp.complete", "connection.connect_unix_socket.complete") and connect_started:
+                self.connect.observe((now - connect_started[0]) * 1000)
+
+        return trace
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        extensions["trace"] = self._tracer(started)
+        self.requests += 1
+        if self.in_flight >= self.max_connections:
+            self.saturated += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await self.client.request(method, url, extensions=extensions, **kwargs)
+        except httpx.HTTPError:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def _should_hedge(self, method: str, url: str) -> bool:
+        return method == "GET" and self.hedge_delay_ms > 0 and urlsplit(str(url)).path in self.hedge_paths
+
+    async def _hedged(self, url: str, can_hedge, **kwargs) -> httpx.Response:
+        primary = asyncio.ensure_future(self._send("GET", url, **kwargs))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay_ms / 1000)
+        except asyncio.CancelledError:
+            # `asyncio.wait` n'annule pas les tâches qu'il attend
+            primary.cancel()
+            raise
+        if done or not can_hedge():
+            return await primary
+        self.hedges += 1
+        hedge = asyncio.ensure_future(self._send("GET", url, **kwargs))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+            # Les deux appels ont échoué: on remonte l'erreur du premier
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        method = method.upper()
+        route = route_key(method, url)
+        breaker = self.breakers.get(route)
+        probe = breaker.before_call() if breaker is not None else False
+        started = time.perf_counter()
+        try:
+            if self._should_hedge(method, url):
+
+                def can_hedge() -> bool:
+                    return self.in_flight < self.max_connections and (breaker is None or breaker.state == CLOSED)
+
+                response = await self._hedged(url, can_hedge, **kwargs)
+            else:
+                response = await self._send(method, url, **kwargs)
+        except httpx.TransportError:
+            if breaker is not None:
+                self.breakers.record(route, breaker, success=False, probe=probe)
+            raise
+        except BaseException:
+            # Annulation ou erreur sans rapport avec le service auth
+            if breaker is not None:
+                breaker.release(probe)
+            raise
+        if breaker is not None:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            success = response.status_code < 500 and not breaker.is_slow(elapsed_ms)
+            self.breakers.record(route, breaker, success=success, probe=probe)
+        return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    def stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "http2": self.http2,
+            "uds": self.uds,
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturated": self.saturated,
+            "pool_wait": self.pool_wait.stats(),
+            "connect": self.connect.stats(),
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "circuits": self.breakers.stats(),
+        }
@@ -0,0 +1,36 @@
+"""Cache en mémoire des organisations de chaque utilisateur (TTL court + LRU)."""
+from __future__ import annotations
+
+from typing import Optional
+
+from projet.app.ttl_cache import TTLCache
+
+
+class OrganizationCache(TTLCache):
+    """Liste des organisations d'un utilisateur, indexée par id utilisateur.
+
+    Alimenté par les réponses `/auth/context`, invalidé quand l'utilisateur
+    crée ou sélectionne une organisation depuis l'app web. Une adhésion
+    modifiée ailleurs est visible au plus tard après `ttl` secondes.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 30.0):
+        super().__init__(max_entries=max_entries, ttl=ttl)
+
+    def get(self, user_id) -> Optional[list[dict]]:
+        if user_id is None:
+            return None
+        return super().get(user_id)
+
+    def set(self, user_id, organizations: list[dict]) -> None:
+        if user_id is None:
+            return
+        super().set(user_id, organizations)
+
+
+def resolve_active_organization(organizations: list[dict], organization_id: str | None) -> dict | None:
+    """Même règle que `/auth/context`: l'organisation demandée si membre, sinon la première."""
+    active = next((o for o in organizations if o.get("id") == organization_id), None)
+    if active is None and organizations:
+        active = organizations[0]
+    return active
@@ -0,0 +1,53 @@
+"""Cache en mémoire des sessions vérifiées par le service auth (TTL + LRU)."""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Optional
+
+import jwt
+
+from projet.app.ttl_cache import TTLCache
+
+
+def token_digest(token: str) -> str:
+    """Empreinte SHA-256 du token (le token brut n'est jamais conservé en mémoire)."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _token_exp(token: str) -> Optional[float]:
+    """Lit le claim `exp` sans vérifier la signature (déjà validée par le service auth)."""
+    try:
+        payload = jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return None
+    exp = payload.get("exp")
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+class SessionCache(TTLCache):
+    """Cache TTL + LRU des réponses `/me`, indexé par empreinte de token.
+
+    Une entrée n'est jamais conservée au-delà du `exp` du JWT; les tokens sans
+    `exp` lisible ne sont pas mis en cache.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 60.0):
+        super().__init__(max_entries=max_entries, ttl=ttl)
+
+    def _key(self, token: str) -> str:
+        return token_digest(token)
+
+    def set(self, token: str, user: dict) -> None:
+        if not self.enabled:
+            return
+        exp = _token_exp(token)
+        if exp is None:
+            return
+        super().set(token, user, ttl=exp - time.time())
+
+    def invalidate_user(self, user_id) -> None:
+        """Supprime toutes les sessions d'un utilisateur (ex: changement de mot de passe)."""
+        stale = [k for k, (_, user) in self._entries.items() if user.get("id") == user_id]
+        for key in stale:
+            del self._entries[key]
@@ -0,0 +1,109 @@
+"""Environnement Jinja2 de l'app web: cache de bytecode, précompilation, rendu.
+
+Les templates compilés sont écrits dans un `FileSystemBytecodeCache` partagé
+par tous les workers: un worker qui démarre charge le bytecode au lieu de
+recompiler chaque template. `precompile_templates` remplit ce cache en
+avance (étape de build de l'image, voir scripts/precompile_templates.py).
+
+`stream_template` rend une page par morceaux (`Template.generate`): la
+coquille (en-tête, titre...) part tout de suite, les zones marquées
+`{{ stream_slot("nom") }}` sont rendues à l'arrivée de leurs données.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import os
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def build_templates(directory: str, bytecode_cache_dir: str | None, auto_reload: bool = True) -> Jinja2Templates:
+    """`Jinja2Templates` avec cache de bytecode (si `bytecode_cache_dir`).
+
+    Sans `auto_reload`, Jinja ne vérifie plus la date des fichiers à chaque
+    rendu: les templates ne changent qu'au déploiement.
+    """
+    templates = Jinja2Templates(directory=directory)
+    env = templates.env
+    if bytecode_cache_dir:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        env.bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+    env.auto_reload = auto_reload
+    return templates
+
+
+def precompile_templates(templates: Jinja2Templates) -> int:
+    """Compile tous les templates (et remplit le cache de bytecode); retourne leur nombre."""
+    names = templates.env.list_templates(extensions=("html",))
+    for name in names:
+        templates.env.get_template(name)
+    return len(names)
+
+
+def template_response_factory(templates: Jinja2Templates) -> Callable[..., Response]:
+    """Choisit une fois pour toutes la signature de `TemplateResponse`.
+
+    Starlette >= 0.29 prend la requête en paramètre (`request=`), les
+    versions antérieures l'attendent uniquement dans le contexte.
+    """
+    parameters = inspect.signature(templates.TemplateResponse).parameters
+    takes_request = "request" in parameters or any(
+        p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()
+    )
+
+    if takes_request:
+        def render(name: str, request: Request, context: dict, **kwargs) -> Response:
+            return templates.TemplateResponse(request=request, name=name, context=context, **kwargs)
+    else:
+        def render(name: str, request: Request, context: dict, **kwargs) -> Response:
+            return templates.TemplateResponse(name=name, context=context, **kwargs)
+
+    return render
+
+
+_SLOT_PREFIX = "<!--stream-slot:"
+_SLOT_SUFFIX = "-->"
+
+
+def _stream_slot(name: str) -> Markup:
+    return Markup(f"{_SLOT_PREFIX}{name}{_SLOT_SUFFIX}")
+
+
+async def stream_template(
+    templates: Jinja2Templates,
+    name: str,
+    context: dict,
+    slots: dict[str, tuple[str, Awaitable[dict]]],
+) -> AsyncIterator[str]:
+    """Rend `name` en flux pour une `StreamingResponse`.
+
+    `slots` associe à chaque zone `{{ stream_slot("nom") }}` du template un
+    template fragment et l'awaitable qui fournit son contexte. Tout ce qui
+    précède une zone est envoyé avant d'attendre ses données; le fragment est
+    rendu avec le contexte de la page complété par ces données. Les
+    awaitables sont lancés en tâches dès le début pour avancer pendant
+    l'envoi de la coquille; ceux qui n'ont pas été consommés (client
+    déconnecté, erreur de rendu) sont annulés à la fin du flux.
+    """
+    tasks = {slot: (fragment, asyncio.ensure_future(pending)) for slot, (fragment, pending) in slots.items()}
+    try:
+        buffer: list[str] = []
+        for chunk in templates.get_template(name).generate({**context, "stream_slot": _stream_slot}):
+            if chunk.startswith(_SLOT_PREFIX) and chunk.endswith(_SLOT_SUFFIX):
+                yield "".join(buffer)
+                buffer = []
+                fragment, task = tasks[chunk[len(_SLOT_PREFIX):-len(_SLOT_SUFFIX)]]
+                data = await task
+                yield templates.get_template(fragment).render({**context, **data})
+            else:
+                buffer.append(chunk)
+        yield "".join(buffer)
+    finally:
+        for _, task in tasks.values():
+            task.cancel()
@@ -0,0 +1,74 @@
+"""Cache en mémoire à durée de vie bornée (TTL) et éviction LRU, partagé par les caches de l'app web."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Entrées expirant après `ttl` secondes, au plus `max_entries` (les moins récemment lues sortent d'abord).
+
+    Les sous-classes choisissent la clé stockée (`_key`); `ttl` ou
+    `max_entries` à 0 désactive le cache.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def _key(self, key: Hashable) -> str:
+        return str(key)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        stored = self._key(key)
+        entry = self._entries.get(stored)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[stored]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(stored)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Enregistre `value` pour `ttl` secondes (par défaut `self.ttl`)."""
+        if not self.enabled:
+            return
+        lifetime = self.ttl if ttl is None else min(self.ttl, ttl)
+        if lifetime <= 0:
+            return
+        stored = self._key(key)
+        self._entries[stored] = (time.monotonic() + lifetime, value)
+        self._entries.move_to_end(stored)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(self._key(key), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
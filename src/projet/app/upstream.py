@@ -0,0 +1,44 @@
+"""Agrégation des appels au service auth à l'échelle d'une requête SSR."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable
+from urllib.parse import urlsplit
+
+import httpx
+
+
+class UpstreamBatch:
+    """Appels GET d'une requête SSR: lancés en parallèle, dédoublonnés, chronométrés.
+
+    Deux GET identiques (même URL, mêmes en-têtes) pendant la même requête
+    partagent un seul appel réseau. Les durées sont exposées via `timings`.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self.timings: list[tuple[str, float]] = []
+
+    def get(self, url: str, headers: dict[str, str] | None = None) -> Awaitable[httpx.Response]:
+        """Démarre (ou réutilise) le GET et retourne un awaitable partagé."""
+        key = (url, tuple(sorted((headers or {}).items())))
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._timed(url, self._client.get(url, headers=headers)))
+            # Un préchargement jamais attendu ne doit pas polluer les logs
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._inflight[key] = future
+        return future
+
+    async def _timed(self, url: str, call: Awaitable[httpx.Response]) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            return await call
+        finally:
+            self.timings.append((f"GET {urlsplit(url).path}", (time.perf_counter() - start) * 1000))
+
+    def server_timing(self) -> str:
+        """Valeur d'en-tête `Server-Timing` (une entrée par appel amont)."""
+        return ", ".join(f'upstream;desc="{desc}";dur={dur:.1f}' for desc, dur in self.timings)
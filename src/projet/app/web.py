@@ -1,17 +1,26 @@
 from __future__ import annotations
 
 from fastapi import FastAPI, Request, Form, Response, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from dataclasses import dataclass
+from typing import Awaitable, Optional
 import httpx
+import logging
 import os
 from urllib.parse import urlencode
+from jwt.exceptions import InvalidTokenError
 
 from projet.settings import settings
+from projet.auth import tokens
 from projet.middleware import setup_error_middleware
+from projet.app.session_cache import SessionCache
+from projet.app.organization_cache import OrganizationCache, resolve_active_organization
+from projet.app.upstream import UpstreamBatch
+from projet.app.http_client import UpstreamClient
+from projet.app.circuit_breaker import CircuitBreakers
+from projet.app.templating import build_templates, stream_template, template_response_factory
 
 
 class CookieConfig(BaseModel):
@@ -22,19 +31,70 @@ class CookieConfig(BaseModel):
     samesite: str = "strict" if settings.APP_ENV == "production" else settings.COOKIE_SAMESITE
 
 
+logger = logging.getLogger(__name__)
+
 AUTH_SERVICE_URL = settings.AUTH_SERVICE_URL
 COOKIE = CookieConfig()
 ACTIVE_ORG_COOKIE = "active_organization_id"
-HTTP_TIMEOUT = 5.0
-client = httpx.AsyncClient(timeout=HTTP_TIMEOUT)
+HTTP_TIMEOUT = settings.WEB_UPSTREAM_TIMEOUT
+client = UpstreamClient(
+    timeout=HTTP_TIMEOUT,
+    connect_timeout=settings.WEB_UPSTREAM_CONNECT_TIMEOUT,
+    max_connections=settings.WEB_UPSTREAM_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.WEB_UPSTREAM_MAX_KEEPALIVE,
+    keepalive_expiry=settings.WEB_UPSTREAM_KEEPALIVE_EXPIRY,
+    http2=settings.WEB_UPSTREAM_HTTP2,
+    uds=settings.WEB_UPSTREAM_UDS,
+    breakers=CircuitBreakers(
+        failure_threshold=settings.WEB_CIRCUIT_FAILURE_THRESHOLD,
+        slow_call_ms=settings.WEB_CIRCUIT_SLOW_CALL_MS,
+        reset_timeout=settings.WEB_CIRCUIT_RESET_TIMEOUT,
+        slow_call_exempt=tuple(route.strip() for route in settings.WEB_CIRCUIT_SLOW_CALL_EXEMPT.split(",") if route.strip()),
+    ),
+    hedge_delay_ms=settings.WEB_UPSTREAM_HEDGE_DELAY_MS,
+    hedge_paths=tuple(path.strip() for path in settings.WEB_UPSTREAM_HEDGE_PATHS.split(",") if path.strip()),
+)
+session_cache = SessionCache(
+    max_entries=settings.WEB_SESSION_CACHE_MAX_ENTRIES,
+    ttl=settings.WEB_SESSION_CACHE_TTL,
+)
+organization_cache = OrganizationCache(
+    max_entries=settings.WEB_ORG_CACHE_MAX_ENTRIES,
+    ttl=settings.WEB_ORG_CACHE_TTL,
+)
 
 app = FastAPI(title="Minimal Web App")
 
 # Middleware de gestion d'erreurs global
 setup_error_middleware(app)
 
+
+@app.on_event("startup")
+async def startup_event():
+    await client.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await client.aclose()
+
+
+@app.middleware("http")
+async def upstream_timing_middleware(request: Request, call_next):
+    """Expose la durée des appels au service auth via l'en-tête Server-Timing."""
+    response = await call_next(request)
+    upstream = getattr(request.state, "upstream", None)
+    if upstream is not None and upstream.timings:
+        response.headers["Server-Timing"] = upstream.server_timing()
+    return response
+
 base_dir = os.path.dirname(os.path.abspath(__file__))
-templates = Jinja2Templates(directory=os.path.join(base_dir, "templates"))
+templates = build_templates(
+    os.path.join(base_dir, "templates"),
+    bytecode_cache_dir=settings.WEB_TEMPLATE_CACHE_DIR or None,
+    auto_reload=settings.APP_ENV != "production",
+)
+template_response = template_response_factory(templates)
 
 static_dir = os.path.join(base_dir, "static")
 if not os.path.exists(static_dir):
@@ -45,83 +105,306 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 def get_token_from_cookie(request: Request) -> str | None:
     return request.cookies.get(COOKIE.name)
 
+
+def get_upstream(request: Request) -> UpstreamBatch:
+    """Agrégateur d'appels amont propre à la requête courante."""
+    upstream = getattr(request.state, "upstream", None)
+    if upstream is None:
+        upstream = UpstreamBatch(client)
+        request.state.upstream = upstream
+    return upstream
+
 def login_redirect(next_path: str | None = None) -> RedirectResponse:
     params = f"?{urlencode({'next': next_path})}" if next_path else ""
     return RedirectResponse(url=f"/login{params}", status_code=303)
 
 
-async def require_auth(request: Request) -> tuple[str, dict] | RedirectResponse:
-    """Assure que l'utilisateur est authentifié pour une page SSR."""
+async def fetch_me(token: str, upstream: UpstreamBatch | None = None) -> dict | None:
+    """Retourne le profil `/me` (cache de session d'abord), None si le token est refusé.
+
+    Lève httpx.HTTPError si le service auth est injoignable.
+    """
+    user = session_cache.get(token)
+    if user is not None:
+        return user
+    get = upstream.get if upstream is not None else client.get
+    me_resp = await get(f"{AUTH_SERVICE_URL}/me", headers={"Authorization": f"Bearer {token}"})
+    if me_resp.status_code != 200:
+        session_cache.invalidate(token)
+        return None
+    user = me_resp.json()
+    session_cache.set(token, user)
+    return user
+
+
+def verify_token_locally(token: str) -> dict | None:
+    """Vérifie le JWT d'accès sans appeler le service auth (WEB_LOCAL_JWT_VERIFY).
+
+    Retourne l'utilisateur issu des claims (id, email, roles), ou None si le
+    token est invalide/expiré. Lève RuntimeError si aucune clé n'est configurée.
+    """
+    try:
+        payload = tokens.decode_token(token)
+        user_id = int(payload["sub"])
+    except (InvalidTokenError, KeyError, ValueError):
+        return None
+    if payload.get("type") != "access":
+        return None
+    return {"id": user_id, "email": payload.get("email"), "roles": payload.get("roles", [])}
+
+
+def session_expired_redirect(next_path: str | None = None) -> RedirectResponse:
+    resp = login_redirect(next_path=next_path)
+    resp.delete_cookie(COOKIE.name, path="/", domain=COOKIE.domain)
+    return resp
+
+
+async def require_auth(request: Request, profile: bool = False) -> tuple[str, dict] | RedirectResponse:
+    """Assure que l'utilisateur est authentifié pour une page SSR.
+
+    `profile=True` force l'appel à `/me` pour les pages qui affichent les champs
+    du profil (nom, préférences...) absents des claims du JWT.
+    """
     next_path = request.url.path
     token = get_token_from_cookie(request)
     if not token:
         return login_redirect(next_path=next_path)
 
+    if settings.WEB_LOCAL_JWT_VERIFY and not profile:
+        try:
+            claims = verify_token_locally(token)
+        except RuntimeError as e:
+            logger.warning(f"Vérification JWT locale impossible, repli sur /me: {e}")
+        else:
+            if claims is None:
+                return session_expired_redirect(next_path=next_path)
+            # Les anciens tokens sans claim email passent par /me
+            if claims.get("email"):
+                return token, claims
+
     try:
-        me_resp = await client.get(f"{AUTH_SERVICE_URL}/me", headers={"Authorization": f"Bearer {token}"})
+        user = await fetch_me(token, upstream=get_upstream(request))
     except httpx.HTTPError:
         return login_redirect(next_path=next_path)
 
-    if me_resp.status_code != 200:
-        resp = login_redirect(next_path=next_path)
-        resp.delete_cookie(COOKIE.name, path="/", domain=COOKIE.domain)
-        return resp
+    if user is None:
+        return session_expired_redirect(next_path=next_path)
+
+    return token, user
+
+
+def client_ip_headers(request: Request) -> dict[str, str]:
+    """IP du navigateur pour le rate limiting par IP du service auth
+    (lue seulement si l'app web fait partie de RATE_LIMIT_TRUSTED_PROXIES).
+    """
+    return {"X-Forwarded-For": request.client.host} if request.client else {}
 
-    return token, me_resp.json()
+
+def auth_headers(token: str, organization_id: str | None = None) -> dict[str, str]:
+    headers = {"Authorization": f"Bearer {token}"}
+    if organization_id:
+        headers["organization-id"] = organization_id
+    return headers
+
+
+@dataclass
+class PageContext:
+    """Données communes aux pages SSR, issues d'un seul appel à `/auth/context`."""
+    token: str
+    user: dict
+    organizations: list[dict]
+    active_organization: dict | None
+    projects: list[dict]
+    project: dict | None
+    error: str | None = None  # appel /auth/context en échec: page rendue en mode dégradé
+
+    @property
+    def active_organization_id(self) -> str | None:
+        return self.active_organization.get("id") if self.active_organization else None
+
+    @property
+    def active_organization_name(self) -> str | None:
+        return self.active_organization.get("name") if self.active_organization else None
+
+    def template_vars(self) -> dict:
+        return {
+            "user": self.user,
+            "active_organization_id": self.active_organization_id,
+            "active_organization_name": self.active_organization_name,
+            "organizations": self.organizations,
+        }
+
+
+def cached_page_context(request: Request, token: str) -> PageContext | None:
+    """Contexte sans projets reconstruit depuis les caches (session + organisations),
+    sans appel au service auth. None si l'un des deux manque.
+    """
+    user = session_cache.get(token)
+    if user is None:
+        return None
+    organizations = organization_cache.get(user.get("id"))
+    if organizations is None:
+        return None
+    requested = request.cookies.get(ACTIVE_ORG_COOKIE)
+    if requested and not any(o.get("id") == requested for o in organizations):
+        # Organisation absente du cache (rejointe entre-temps?): le service auth tranche
+        return None
+    return PageContext(
+        token=token,
+        user=user,
+        organizations=organizations,
+        active_organization=resolve_active_organization(organizations, requested),
+        projects=[],
+        project=None,
+    )
 
 
-async def get_organizations_context(request: Request, token: str) -> tuple[str | None, str | None, list[dict]]:
-    """Retourne (active_org_id, active_org_name, organizations)."""
+async def load_page_context(
+    request: Request,
+    include_projects: bool = False,
+    project_id: str | None = None,
+) -> PageContext | RedirectResponse:
+    """Authentifie la requête et charge utilisateur, organisations et projets
+    en un aller-retour (`/auth/context`), l'organisation active étant résolue
+    côté service auth à partir du cookie.
+    """
+    next_path = request.url.path
+    token = get_token_from_cookie(request)
+    if not token:
+        return login_redirect(next_path=next_path)
+
+    if not include_projects and not project_id:
+        page = cached_page_context(request, token)
+        if page is not None:
+            return page
+
     try:
-        r = await client.get(
-            f"{AUTH_SERVICE_URL}/auth/organizations",
-            headers={"Authorization": f"Bearer {token}"},
+        r = await request_page_context(request, token, include_projects, project_id)
+    except httpx.HTTPError:
+        return login_redirect(next_path=next_path)
+
+    if r.status_code in (401, 403):
+        return session_expired_redirect(next_path=next_path)
+    page = page_context_from_response(token, r)
+    if page is None:
+        error = (
+            "Impossible de récupérer la liste des projets"
+            if include_projects or project_id
+            else "Impossible de récupérer les organisations"
         )
+        return await degraded_page_context(request, token, error)
+    return page
+
+
+async def degraded_page_context(request: Request, token: str, error: str) -> PageContext | RedirectResponse:
+    """`/auth/context` en erreur (5xx, réponse illisible): la session n'est pas
+    remise en cause. Utilisateur via le cache de session ou `/me`,
+    organisations depuis le cache si possible, pas de projets.
+    """
+    next_path = request.url.path
+    try:
+        user = await fetch_me(token, upstream=get_upstream(request))
     except httpx.HTTPError:
-        return None, None, []
+        return login_redirect(next_path=next_path)
+    if user is None:
+        return session_expired_redirect(next_path=next_path)
+
+    requested = request.cookies.get(ACTIVE_ORG_COOKIE)
+    organizations = organization_cache.get(user.get("id"))
+    if organizations:
+        active = resolve_active_organization(organizations, requested)
+    else:
+        organizations = []
+        # Les actions sur un projet restent dans l'organisation du cookie (vérifiée par le service auth)
+        active = {"id": requested, "name": None} if requested else None
+    return PageContext(
+        token=token,
+        user=user,
+        organizations=organizations,
+        active_organization=active,
+        projects=[],
+        project=None,
+        error=error,
+    )
 
-    if r.status_code != 200:
-        return None, None, []
 
-    organizations = r.json() if isinstance(r.json(), list) else []
-    if not organizations:
-        return None, None, []
+def request_page_context(
+    request: Request,
+    token: str,
+    include_projects: bool = False,
+    project_id: str | None = None,
+) -> Awaitable[httpx.Response]:
+    """Lance l'appel `/auth/context` (déjà en cours au retour) et retourne son awaitable."""
+    params = {"include_projects": "true" if include_projects else "false"}
+    if project_id:
+        params["project_id"] = project_id
+    return get_upstream(request).get(
+        f"{AUTH_SERVICE_URL}/auth/context?{urlencode(params)}",
+        headers=auth_headers(token, request.cookies.get(ACTIVE_ORG_COOKIE)),
+    )
 
-    current_cookie_org = request.cookies.get(ACTIVE_ORG_COOKIE)
-    active_org = next((o for o in organizations if o.get("id") == current_cookie_org), None)
-    if active_org is None:
-        active_org = organizations[0]
 
-    return active_org.get("id"), active_org.get("name"), organizations
+def page_context_from_response(token: str, r: httpx.Response) -> PageContext | None:
+    """PageContext d'une réponse `/auth/context` (caches mis à jour), None si elle est inexploitable."""
+    try:
+        data = r.json() if r.status_code == 200 else None
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or not isinstance(data.get("user"), dict):
+        return None
+
+    user = data["user"]
+    organizations = data.get("organizations") or []
+    session_cache.set(token, user)
+    organization_cache.set(user.get("id"), organizations)
+    return PageContext(
+        token=token,
+        user=user,
+        organizations=organizations,
+        active_organization=data.get("active_organization"),
+        projects=data.get("projects") or [],
+        project=data.get("project"),
+    )
 
 
-def auth_headers(token: str, organization_id: str | None = None) -> dict[str, str]:
-    headers = {"Authorization": f"Bearer {token}"}
-    if organization_id:
-        headers["organization-id"] = organization_id
-    return headers
+def start_streamed_page(request: Request) -> tuple[PageContext, Awaitable[PageContext | None]] | None:
+    """Mode streaming: coquille de page depuis les caches et chargement des
+    projets lancé en parallèle. None (rendu classique) si le mode est
+    désactivé ou si la session n'est pas en cache: sans elle, le statut de
+    la réponse dépend de l'appel amont et ne peut pas partir avant lui.
+    """
+    token = get_token_from_cookie(request)
+    if not settings.WEB_STREAMING_RENDER or not token:
+        return None
+    shell = cached_page_context(request, token)
+    if shell is None:
+        return None
+    pending = request_page_context(request, token, include_projects=True)
+
+    async def full_page() -> PageContext | None:
+        try:
+            return page_context_from_response(token, await pending)
+        except httpx.HTTPError:
+            return None
+        except Exception:
+            # Le statut 200 et la coquille sont déjà partis: la zone affiche son état d'erreur
+            logger.exception("Contexte de page inexploitable pendant le rendu en flux")
+            return None
+
+    return shell, full_page()
+
+
+def stream_page(request: Request, name: str, shell: PageContext, slots: dict) -> StreamingResponse:
+    context = {"request": request, **shell.template_vars()}
+    return StreamingResponse(stream_template(templates, name, context, slots), media_type="text/html")
 
 
 def render_template(name: str, context: dict, **kwargs):
-    """Compat rendering across Starlette TemplateResponse signatures."""
+    """Rendu d'un template (signature de TemplateResponse résolue au démarrage)."""
     request = context.get("request")
     if request is None:
         raise ValueError("Template context must include 'request'")
-
-    # Starlette signature differs by version.
-    # Try modern keyword signature first, then legacy positional forms.
-    try:
-        return templates.TemplateResponse(name=name, request=request, context=context, **kwargs)
-    except TypeError:
-        pass
-
-    try:
-        return templates.TemplateResponse(name=name, context=context, **kwargs)
-    except TypeError:
-        pass
-
-    # Legacy: TemplateResponse(name, request, context, ...)
-    return templates.TemplateResponse(name, request, context, **kwargs)
+    return template_response(name, request, context, **kwargs)
 
 @app.get("/", response_class=HTMLResponse)
 def index(request: Request):
@@ -171,7 +454,7 @@ async def signup(
             "password": password,
             "first_name": None,
             "last_name": None
-        })
+        }, headers=client_ip_headers(request))
         if r.status_code >= 400:
             try:
                 if r.headers.get("content-type", "").startswith("application/json"):
@@ -216,7 +499,7 @@ def login_page(request: Request):
 @app.post("/login")
 async def login(request: Request, response: Response, email: EmailStr = Form(...), password: str = Form(...)):
     data = {"username": str(email), "password": password}
-    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    headers = {"Content-Type": "application/x-www-form-urlencoded", **client_ip_headers(request)}
     form = await request.form()
     next_path = form.get("next") or request.query_params.get("next") or "/dashboard"
     try:
@@ -241,6 +524,9 @@ async def login(request: Request, response: Response, email: EmailStr = Form(...
 
 @app.get("/logout")
 def logout(request: Request):
+    token = get_token_from_cookie(request)
+    if token:
+        session_cache.invalidate(token)
     resp = RedirectResponse(url="/", status_code=303)
     resp.delete_cookie(COOKIE.name, path="/", domain=COOKIE.domain)
     resp.delete_cookie(ACTIVE_ORG_COOKIE, path="/", domain=COOKIE.domain)
@@ -257,87 +543,102 @@ async def health():
         ok_auth = r.status_code == 200
     except Exception:
         ok_auth = False
-    status = {"status": "ok", "auth": ok_auth}
+    status = {
+        "status": "ok",
+        "auth": ok_auth,
+        "session_cache": session_cache.stats(),
+        "organization_cache": organization_cache.stats(),
+        "upstream_pool": client.stats(),
+    }
     code = 200
     return JSONResponse(status, status_code=code)
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request):
-    auth = await require_auth(request)
-    if isinstance(auth, RedirectResponse):
-        return auth
-    token, user = auth
-    active_org_id, active_org_name, organizations = await get_organizations_context(request, token)
-    project_count = 0
-    try:
-        projects_resp = await client.get(
-            f"{AUTH_SERVICE_URL}/auth/projects",
-            headers=auth_headers(token, active_org_id),
+    streamed = start_streamed_page(request)
+    if streamed is not None:
+        shell, full_page = streamed
+
+        async def project_count() -> dict:
+            page = await full_page
+            return {"project_count": len(page.projects) if page is not None else "–"}
+
+        return stream_page(
+            request, "dashboard.html", shell, {"project-count": ("components/project_count.html", project_count())}
         )
-        if projects_resp.status_code == 200 and isinstance(projects_resp.json(), list):
-            project_count = len(projects_resp.json())
-    except httpx.HTTPError:
-        project_count = 0
+
+    page = await load_page_context(request, include_projects=True)
+    if isinstance(page, RedirectResponse):
+        return page
 
     return render_template(
         "dashboard.html",
         {
             "request": request,
-            "user": user,
-            "project_count": project_count,
-            "active_organization_id": active_org_id,
-            "active_organization_name": active_org_name,
-            "organizations": organizations,
+            "project_count": len(page.projects),
+            **page.template_vars(),
         },
     )
 
 
 @app.get("/projects", response_class=HTMLResponse)
 async def projects_page(request: Request):
-    auth = await require_auth(request)
-    if isinstance(auth, RedirectResponse):
-        return auth
-    token, user = auth
-    active_org_id, active_org_name, organizations = await get_organizations_context(request, token)
-
-    try:
-        r = await client.get(f"{AUTH_SERVICE_URL}/auth/projects", headers=auth_headers(token, active_org_id))
-    except httpx.HTTPError:
-        return login_redirect(next_path=request.url.path)
+    streamed = start_streamed_page(request)
+    if streamed is not None:
+        shell, full_page = streamed
+
+        async def project_list() -> dict:
+            page = await full_page
+            if page is None:
+                return {"projects": [], "error": "Impossible de charger les projets, rechargez la page"}
+            return {"projects": page.projects, "error": None}
+
+        return stream_page(
+            request, "projects.html", shell, {"project-list": ("components/project_list.html", project_list())}
+        )
 
-    projects = r.json() if r.status_code == 200 else []
-    error = None if r.status_code == 200 else "Impossible de récupérer la liste des projets"
+    page = await load_page_context(request, include_projects=True)
+    if isinstance(page, RedirectResponse):
+        return page
 
     return render_template(
         "projects.html",
         {
             "request": request,
-            "projects": projects,
-            "error": error,
-            "user": user,
-            "active_organization_id": active_org_id,
-            "active_organization_name": active_org_name,
-            "organizations": organizations,
+            "projects": page.projects,
+            "error": page.error,
+            **page.template_vars(),
         },
     )
 
 
+@app.get("/projects/fragment", response_class=HTMLResponse)
+async def projects_fragment(request: Request):
+    """Liste des projets seule, pour un rafraîchissement sur place."""
+    page = await load_page_context(request, include_projects=True)
+    if isinstance(page, RedirectResponse):
+        # Pas de redirection dans un fragment: le client garde la liste affichée
+        return Response(status_code=401)
+    return render_template(
+        "components/project_list.html",
+        {"request": request, "projects": page.projects, "error": page.error},
+    )
+
+
 @app.post("/projects", response_class=HTMLResponse)
 async def create_project_page(
     request: Request,
 ):
-    auth = await require_auth(request)
-    if isinstance(auth, RedirectResponse):
-        return auth
-    token, user = auth
-    active_org_id, active_org_name, organizations = await get_organizations_context(request, token)
+    page = await load_page_context(request)
+    if isinstance(page, RedirectResponse):
+        return page
 
     try:
         r = await client.post(
             f"{AUTH_SERVICE_URL}/auth/projects",
             json={},
-            headers=auth_headers(token, active_org_id),
+            headers=auth_headers(page.token, page.active_organization_id),
         )
     except httpx.HTTPError:
         # Re-afficher la page avec une erreur générique
@@ -347,29 +648,14 @@ async def create_project_page(
                 "request": request,
                 "projects": [],
                 "error": "Impossible de créer le projet (service indisponible)",
-                "user": user,
-                "active_organization_id": active_org_id,
-                "active_organization_name": active_org_name,
-                "organizations": organizations,
+                **page.template_vars(),
             },
         )
 
     if r.status_code >= 400:
-        # Récupérer les projets et l'utilisateur pour réafficher la page avec une erreur
-        try:
-            list_resp = await client.get(
-                f"{AUTH_SERVICE_URL}/auth/projects",
-                headers=auth_headers(token, active_org_id),
-            )
-            projects = list_resp.json() if list_resp.status_code == 200 else []
-            me_resp = await client.get(
-                f"{AUTH_SERVICE_URL}/me",
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            user = me_resp.json() if me_resp.status_code == 200 else None
-        except httpx.HTTPError:
-            projects = []
-            user = None
+        # Recharger les projets pour réafficher la page avec une erreur
+        refreshed = await load_page_context(request, include_projects=True)
+        projects = refreshed.projects if isinstance(refreshed, PageContext) else []
 
         error_detail = "Erreur lors de la création du projet"
         try:
@@ -385,10 +671,7 @@ async def create_project_page(
                 "request": request,
                 "projects": projects,
                 "error": error_detail,
-                "user": user,
-                "active_organization_id": active_org_id,
-                "active_organization_name": active_org_name,
-                "organizations": organizations,
+                **page.template_vars(),
             },
         )
 
@@ -402,34 +685,19 @@ async def create_project_page(
 
 @app.get("/projects/{project_id}", response_class=HTMLResponse)
 async def project_detail_page(request: Request, project_id: str):
-    auth = await require_auth(request)
-    if isinstance(auth, RedirectResponse):
-        return auth
-    token, user = auth
-    active_org_id, active_org_name, organizations = await get_organizations_context(request, token)
+    page = await load_page_context(request, project_id=project_id)
+    if isinstance(page, RedirectResponse):
+        return page
 
-    try:
-        proj_resp = await client.get(
-            f"{AUTH_SERVICE_URL}/auth/projects/{project_id}",
-            headers=auth_headers(token, active_org_id),
-        )
-    except httpx.HTTPError:
-        return RedirectResponse(url="/projects", status_code=303)
-
-    if proj_resp.status_code != 200:
+    if page.project is None:
         return RedirectResponse(url="/projects", status_code=303)
 
-    project = proj_resp.json()
-
     return render_template(
         "project_detail.html",
         {
             "request": request,
-            "project": project,
-            "user": user,
-            "active_organization_id": active_org_id,
-            "active_organization_name": active_org_name,
-            "organizations": organizations,
+            "project": page.project,
+            **page.template_vars(),
         },
     )
 
@@ -440,11 +708,10 @@ async def rename_project_page(
     project_id: str,
     name: str = Form(...),
 ):
-    auth = await require_auth(request)
-    if isinstance(auth, RedirectResponse):
-        return auth
-    token, _user = auth
-    active_org_id, _active_org_name, _organizations = await get_organizations_context(request, token)
+    page = await load_page_context(request)
+    if isinstance(page, RedirectResponse):
+        return page
+    token, active_org_id = page.token, page.active_organization_id
 
     try:
         await client.patch(
@@ -463,11 +730,10 @@ async def delete_project_page(
     request: Request,
     project_id: str,
 ):
-    auth = await require_auth(request)
-    if isinstance(auth, RedirectResponse):
-        return auth
-    token, _user = auth
-    active_org_id, _active_org_name, _organizations = await get_organizations_context(request, token)
+    page = await load_page_context(request)
+    if isinstance(page, RedirectResponse):
+        return page
+    token, active_org_id = page.token, page.active_organization_id
 
     try:
         await client.delete(
@@ -489,7 +755,7 @@ async def select_organization_web(
     auth = await require_auth(request)
     if isinstance(auth, RedirectResponse):
         return auth
-    token, _user = auth
+    token, user = auth
     try:
         r = await client.post(
             f"{AUTH_SERVICE_URL}/auth/organizations/select",
@@ -501,6 +767,7 @@ async def select_organization_web(
 
     resp = RedirectResponse(url=next_path or "/dashboard", status_code=303)
     if r.status_code == 200:
+        organization_cache.invalidate(user.get("id"))
         resp.set_cookie(
             key=ACTIVE_ORG_COOKIE,
             value=organization_id,
@@ -515,23 +782,18 @@ async def select_organization_web(
 
 @app.get("/organizations", response_class=HTMLResponse)
 async def organizations_page(request: Request):
-    auth = await require_auth(request)
-    if isinstance(auth, RedirectResponse):
-        return auth
-    token, user = auth
-    active_org_id, active_org_name, organizations = await get_organizations_context(request, token)
-    error = None
-    if not organizations:
-        error = "Impossible de récupérer les organisations"
+    page = await load_page_context(request)
+    if isinstance(page, RedirectResponse):
+        return page
+    error = page.error
+    if not page.organizations:
+        error = error or "Impossible de récupérer les organisations"
     return render_template(
         "organizations.html",
         {
             "request": request,
-            "user": user,
-            "organizations": organizations,
-            "active_organization_id": active_org_id,
-            "active_organization_name": active_org_name,
             "error": error,
+            **page.template_vars(),
         },
     )
 
@@ -544,7 +806,7 @@ async def create_organization_web(
     auth = await require_auth(request)
     if isinstance(auth, RedirectResponse):
         return auth
-    token, _user = auth
+    token, user = auth
 
     try:
         r = await client.post(
@@ -556,6 +818,7 @@ async def create_organization_web(
         return RedirectResponse(url="/organizations", status_code=303)
 
     if r.status_code == 201:
+        organization_cache.invalidate(user.get("id"))
         created = r.json()
         org_id = created.get("id")
         resp = RedirectResponse(url="/organizations", status_code=303)
@@ -577,14 +840,21 @@ async def create_organization_web(
 async def require_roles(token: str | None, needed: list[str]) -> bool:
     if not token:
         return False
+    if settings.WEB_LOCAL_JWT_VERIFY:
+        try:
+            claims = verify_token_locally(token)
+        except RuntimeError:
+            claims = None
+        if claims is not None:
+            return all(role in claims["roles"] for role in needed)
     try:
-        r = await client.get(f"{AUTH_SERVICE_URL}/me", headers={"Authorization": f"Bearer {token}"})
-        if r.status_code != 200:
-            return False
-        roles = r.json().get("roles", [])
-        return all(role in roles for role in needed)
+        user = await fetch_me(token)
     except httpx.HTTPError:
         return False
+    if user is None:
+        return False
+    roles = user.get("roles", [])
+    return all(role in roles for role in needed)
 
 
 @app.get("/admin", response_class=HTMLResponse)
@@ -672,7 +942,7 @@ def forgot_password_page(request: Request):
 @app.post("/forgot-password")
 async def forgot_password(request: Request, email: EmailStr = Form(...)):
     try:
-        r = await client.post(f"{AUTH_SERVICE_URL}/auth/request-password-reset", json={"email": email})
+        r = await client.post(f"{AUTH_SERVICE_URL}/auth/request-password-reset", json={"email": email}, headers=client_ip_headers(request))
         if r.status_code == 200:
             return render_template("forgot-password.html", {
                 "request": request, 
@@ -713,7 +983,7 @@ async def reset_password(request: Request, token: str = Form(...), password: str
         r = await client.post(f"{AUTH_SERVICE_URL}/auth/reset-password", json={
             "token": token, 
             "new_password": password
-        })
+        }, headers=client_ip_headers(request))
         if r.status_code == 200:
             return RedirectResponse(url="/login?reset=success", status_code=303)
         else:
@@ -732,7 +1002,7 @@ async def reset_password(request: Request, token: str = Form(...), password: str
 
 @app.get("/account", response_class=HTMLResponse)
 async def account_page(request: Request):
-    auth = await require_auth(request)
+    auth = await require_auth(request, profile=True)
     if isinstance(auth, RedirectResponse):
         return auth
     _token, user = auth
@@ -796,6 +1066,7 @@ async def change_password(request: Request, current_password: str = Form(...), n
     
     # TODO: Implémenter le changement de mot de passe côté API
     # Pour l'instant, on simule un succès
+    session_cache.invalidate_user(user.get("id"))
     return render_template("change-password.html", {
         "request": request, 
         "user": user,
@@ -806,7 +1077,7 @@ async def change_password(request: Request, current_password: str = Form(...), n
 
 @app.get("/settings", response_class=HTMLResponse)
 async def settings_page(request: Request):
-    auth = await require_auth(request)
+    auth = await require_auth(request, profile=True)
     if isinstance(auth, RedirectResponse):
         return auth
     _token, user = auth
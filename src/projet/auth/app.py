@@ -1,13 +1,16 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends
 from fastapi.responses import JSONResponse
-from fastapi.security import OAuth2PasswordBearer
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_limiter import FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from .routers import auth as auth_router
-from .database import Base, engine, get_db
+from .database import Base, engine, pool_stats
 from . import models, security
+from .hashing import password_pool
+from .last_login import last_login_recorder
+from .lockout import login_lockout
+from .ratelimit import rate_limiter
+from .token_maintenance import refresh_token_purger
+from .roles import role_cache
 from projet.settings import settings
 from projet.middleware import setup_error_middleware
 import redis.asyncio as redis
@@ -32,42 +35,53 @@ app.add_middleware(
 async def startup():
     try:
         redis_client = redis.from_url(settings.REDIS_URL if hasattr(settings, 'REDIS_URL') else "redis://localhost:6379")
-        await FastAPILimiter.init(redis_client)
+        await redis_client.ping()
+        login_lockout.use_redis(redis_client)
+        rate_limiter.use_redis(redis_client)
         print("✅ Rate limiting activé avec Redis")
     except Exception as e:
-        print(f"⚠️ Rate limiting désactivé (Redis non disponible): {e}")
+        print(f"⚠️ Redis non disponible, rate limiting local au process: {e}")
+    last_login_recorder.start()
+    refresh_token_purger.start()
 
-app.include_router(auth_router.router)
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+@app.on_event("shutdown")
+async def shutdown():
+    await last_login_recorder.stop()
+    await refresh_token_purger.stop()
+    password_pool.shutdown()
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    try:
-        payload = security.decode_token(token)
-        if payload.get("type") != "access":
-            raise HTTPException(status_code=401, detail="Invalid token type")
-        user_id = int(payload["sub"])
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    u = db.get(models.User, user_id)
-    if not u or not u.is_active:
-        raise HTTPException(401, "Inactive or not found")
-    return u
+app.include_router(auth_router.router)
 
 @app.get("/me")
-def me(user = Depends(get_current_user)):
+def me(user = Depends(security.current_user_loader("me"))):
     return {"id": user.id, "email": user.email, "is_verified": user.is_verified, "roles": [r.name for r in user.roles]}
 
 
+def _ping_db() -> None:
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+
+
 @app.get("/health")
 async def health():
     """Endpoint de santé: non-bloquant en dev; remonte l'état des dépendances."""
-    status = {"status": "ok", "db": False, "redis": False}
-    # Check DB
+    status = {
+        "status": "ok",
+        "db": False,
+        "redis": False,
+        "db_pool": pool_stats(),
+        "password_hashing": password_pool.stats(),
+        "last_login": last_login_recorder.stats(),
+        "login_lockout": login_lockout.stats(),
+        "rate_limit": rate_limiter.stats(),
+        "refresh_token_purge": refresh_token_purger.stats(),
+        "role_cache": role_cache.stats(),
+    }
+    # Check DB (hors de la boucle d'événements)
     try:
-        with engine.connect() as conn:
-            conn.exec_driver_sql("SELECT 1")
-            status["db"] = True
+        await run_in_threadpool(_ping_db)
+        status["db"] = True
     except Exception:
         status["db"] = False
     # Check Redis (optionnel)
@@ -1,27 +1,119 @@
+import time
+from bisect import bisect_left
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 from projet.settings import settings
 
 Base = declarative_base()
 
+
+class PoolMetrics:
+    """Histogramme du temps d'attente pour obtenir une connexion du pool."""
+
+    BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def observe(self, wait_ms: float) -> None:
+        self.counts[bisect_left(self.BUCKETS_MS, wait_ms)] += 1
+        self.checkouts += 1
+        self.wait_ms_total += wait_ms
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def histogram(self) -> dict[str, int]:
+        labels = [f"<={b}ms" for b in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, self.counts))
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool qui mesure l'attente de chaque checkout (et les timeouts)."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        pool_metrics.observe((time.perf_counter() - start) * 1000)
+        return conn
+
+
 engine_kwargs = {
     "future": True,
 }
 
 if settings.DATABASE_URL.startswith("sqlite"):
     engine_kwargs["connect_args"] = {"check_same_thread": False}
+
+if settings.DATABASE_URL.startswith("sqlite") and ":memory:" in settings.DATABASE_URL:
     # SQLite in-memory needs a shared connection pool across threads,
     # otherwise each connection sees an empty DB (no tables).
-    if ":memory:" in settings.DATABASE_URL:
-        engine_kwargs["poolclass"] = StaticPool
+    engine_kwargs["poolclass"] = StaticPool
+else:
+    engine_kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+if settings.DATABASE_URL.startswith("postgresql") and settings.DB_STATEMENT_TIMEOUT_MS:
+    engine_kwargs["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
 
 engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+write_serializer = None
+if (
+    settings.SQLITE_PROFILE == "production"
+    and settings.DATABASE_URL.startswith("sqlite")
+    and ":memory:" not in settings.DATABASE_URL
+):
+    from .sqlite_profile import apply_sqlite_profile
+
+    write_serializer = apply_sqlite_profile(engine, SessionLocal)
+
+
+def pool_stats() -> dict:
+    """État du pool de connexions (exposé par /health)."""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        checkouts = pool_metrics.checkouts or 1
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            checkouts=pool_metrics.checkouts,
+            timeouts=pool_metrics.timeouts,
+            avg_wait_ms=round(pool_metrics.wait_ms_total / checkouts, 3),
+            max_wait_ms=round(pool_metrics.wait_ms_max, 3),
+            wait_ms_histogram=pool_metrics.histogram(),
+        )
+    if write_serializer is not None:
+        stats["sqlite_write_lock_acquisitions"] = write_serializer.acquisitions
+    return stats
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
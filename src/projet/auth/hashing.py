@@ -0,0 +1,103 @@
+"""Pool borné pour le hachage des mots de passe (argon2) hors de la boucle asyncio."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from projet.settings import settings
+
+T = TypeVar("T")
+
+
+class PasswordHashPool:
+    """Exécute hash/verify argon2 dans un pool de threads dédié.
+
+    argon2-cffi relâche le GIL pendant le calcul: des threads suffisent à
+    libérer la boucle d'événements. Au-delà de `max_pending` opérations en
+    cours ou en attente, les nouvelles demandes sont refusées (429) plutôt
+    que d'allonger la file indéfiniment.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()  # compteurs mis à jour depuis les threads du pool
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_ms_total = 0.0
+        self.run_ms_total = 0.0
+        self.run_ms_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status.HTTP_429_TOO_MANY_REQUESTS,
+                    "Service saturé, réessayez dans un instant",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+        submitted = time.perf_counter()
+        started: list[float] = []
+
+        def timed():
+            started.append(time.perf_counter())
+            return fn(*args)
+
+        def release(_future) -> None:
+            # Appelé à la fin du calcul (ou à son annulation s'il n'a pas
+            # démarré), pas quand la requête qui l'attend est annulée: un
+            # client déconnecté ne libère pas la place d'un hachage en cours.
+            with self._lock:
+                self.pending -= 1
+                if started:
+                    run_ms = (time.perf_counter() - started[0]) * 1000
+                    self.completed += 1
+                    self.wait_ms_total += (started[0] - submitted) * 1000
+                    self.run_ms_total += run_ms
+                    self.run_ms_max = max(self.run_ms_max, run_ms)
+
+        try:
+            future = self._get_executor().submit(timed)
+        except BaseException:
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_ms_total / completed, 2),
+            "avg_run_ms": round(self.run_ms_total / completed, 2),
+            "max_run_ms": round(self.run_ms_max, 2),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,94 @@
+"""Écriture différée et groupée de `User.last_login` (LAST_LOGIN_FLUSH_INTERVAL > 0)."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import datetime
+
+from sqlalchemy import bindparam, update
+from starlette.concurrency import run_in_threadpool
+
+from . import models
+from .database import SessionLocal
+from projet.settings import settings
+
+
+class LastLoginRecorder:
+    """Regroupe les `last_login` en mémoire et les écrit en un seul UPDATE.
+
+    Plusieurs logins du même utilisateur entre deux flushs n'écrivent que le
+    plus récent. En cas d'arrêt brutal, au plus `interval` secondes de
+    `last_login` sont perdues: la valeur est indicative, pas une donnée de
+    sécurité.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending: dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self.flushed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def record(self, user_id: int, when: datetime) -> None:
+        with self._lock:
+            self._pending[user_id] = when
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        db = SessionLocal()
+        try:
+            # UPDATE Core groupé (executemany): pas de contrôle du nombre de
+            # lignes, un utilisateur supprimé entre-temps est simplement ignoré
+            users = models.User.__table__
+            db.execute(
+                update(users).where(users.c.id == bindparam("uid")).values(last_login=bindparam("ts")),
+                [{"uid": user_id, "ts": when} for user_id, when in pending.items()],
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            # On remet les valeurs en attente sans écraser un login plus récent
+            with self._lock:
+                for user_id, when in pending.items():
+                    self._pending.setdefault(user_id, when)
+            raise
+        finally:
+            db.close()
+        self.flushed += len(pending)
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await run_in_threadpool(self.flush)
+            except Exception as e:
+                print(f"⚠️ Écriture des last_login différée: {e}")
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.enabled:
+            await run_in_threadpool(self.flush)
+
+    def stats(self) -> dict:
+        return {"interval": self.interval, "pending": len(self._pending), "flushed": self.flushed}
+
+
+last_login_recorder = LastLoginRecorder(interval=settings.LAST_LOGIN_FLUSH_INTERVAL)
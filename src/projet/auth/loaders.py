@@ -0,0 +1,26 @@
+"""Stratégies de chargement des relations de `User`, déclarées par endpoint.
+
+Les relations du modèle restent en chargement paresseux par défaut. Chaque
+endpoint qui parcourt une relation déclare ici son option (selectinload:
+une requête IN par relation, sans multiplier les lignes de `users`), et les
+tests de budget de requêtes (tests/integration/test_auth_query_budgets.py)
+vérifient qu'aucun chargement paresseux ne s'y ajoute.
+"""
+from __future__ import annotations
+
+from sqlalchemy.orm import selectinload
+
+from . import models
+
+USER_LOADERS: dict[str, tuple] = {
+    # Authentification seule: aucune relation
+    "default": (),
+    # GET /me: rôles dans la réponse
+    "me": (selectinload(models.User.roles),),
+    # GET /auth/context: rôles de l'utilisateur pour le rendu SSR
+    "context": (selectinload(models.User.roles),),
+}
+
+
+def user_loader_options(endpoint: str) -> tuple:
+    return USER_LOADERS.get(endpoint, USER_LOADERS["default"])
@@ -0,0 +1,106 @@
+"""Compteur d'échecs de login et verrouillage, hors de la table `users`.
+
+Les échecs sont comptés dans Redis (INCR atomique, expiration posée à la
+première tentative) ou, sans Redis, dans un dictionnaire borné du process.
+La ligne `users` n'est écrite qu'au moment où le compte se verrouille
+(`locked_until`), pas à chaque mauvais mot de passe.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from projet.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "login-failures:"
+_REDIS_WARNING_INTERVAL = 60.0  # s entre deux avertissements "Redis indisponible"
+
+
+class MemoryAttempts:
+    """Fallback mono-process (dev): compteurs avec expiration, éviction LRU."""
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def incr(self, key: str, ttl: int) -> int:
+        now = time.monotonic()
+        with self._lock:
+            count, expires_at = self._entries.pop(key, (0, 0.0))
+            if expires_at <= now:
+                count, expires_at = 0, now + ttl
+            count += 1
+            self._entries[key] = (count, expires_at)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return count
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class LoginLockout:
+    """Façade Redis -> mémoire utilisée par `/auth/login`."""
+
+    def __init__(self, max_attempts: int, window_seconds: int):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self._redis = None
+        self._memory = MemoryAttempts()
+        self._redis_warned_at: float | None = None
+        self.redis_errors = 0
+
+    def use_redis(self, client) -> None:
+        self._redis = client
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return _KEY_PREFIX + email.strip().lower()
+
+    async def register_failure(self, email: str) -> int:
+        """Compte un échec et retourne le nombre d'échecs dans la fenêtre."""
+        key = self._key(email)
+        if self._redis is not None:
+            try:
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    # SET NX EX pose l'expiration une seule fois, INCR reste atomique
+                    pipe.set(key, 0, ex=self.window_seconds, nx=True)
+                    pipe.incr(key)
+                    _, count = await pipe.execute()
+                return int(count)
+            except Exception as e:
+                self.redis_errors += 1
+                now = time.monotonic()
+                if self._redis_warned_at is None or now - self._redis_warned_at >= _REDIS_WARNING_INTERVAL:
+                    self._redis_warned_at = now
+                    logger.warning("Lockout: Redis indisponible, compteur local (%s erreurs): %s", self.redis_errors, e)
+        return self._memory.incr(key, self.window_seconds)
+
+    async def reset(self, email: str) -> None:
+        key = self._key(email)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(key)
+                return
+            except Exception:
+                self.redis_errors += 1
+        self._memory.delete(key)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis" if self._redis is not None else "memory",
+            "max_attempts": self.max_attempts,
+            "redis_errors": self.redis_errors,
+        }
+
+
+login_lockout = LoginLockout(
+    max_attempts=settings.LOGIN_MAX_FAILED_ATTEMPTS,
+    window_seconds=settings.LOGIN_LOCKOUT_MINUTES * 60,
+)
@@ -17,6 +17,8 @@ class User(Base):
     last_login: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     failed_login_attempts: Mapped[int] = mapped_column(Integer, default=0)
     locked_until: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    # Renseigné dès que l'org perso existe (pas de FK: éviterait un cycle users <-> organizations)
+    personal_organization_id: Mapped[str] = mapped_column(String(36), nullable=True)
     
     # Nouveaux champs pour le profil utilisateur
     first_name: Mapped[str] = mapped_column(String(100), nullable=True)
@@ -42,6 +44,13 @@ class Role(Base):
     users: Mapped[list[User]] = relationship("User", secondary="user_roles", back_populates="roles")
 
 
+class CacheVersion(Base):
+    """Numéro de version par cache process (ex. "roles"), incrémenté à chaque modification."""
+    __tablename__ = "cache_versions"
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
 class UserRole(Base):
     __tablename__ = "user_roles"
     __table_args__ = (UniqueConstraint("user_id", "role_id", name="uq_user_role"),)
@@ -54,15 +63,18 @@ class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     token_hash: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     is_revoked: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Chaîne de rotation issue d'un même login (révocation groupée en cas de rejeu)
+    family_id: Mapped[str] = mapped_column(String(36), nullable=True, index=True)
     user: Mapped["User"] = relationship("User")
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (UniqueConstraint("organization_id", "name", name="uq_project_organization_name"),)
 
     # UUID stocké en texte pour compatibilité SQLite / Postgres
     id: Mapped[str] = mapped_column(
@@ -112,6 +124,8 @@ class Organization(Base):
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     org_type: Mapped[str] = mapped_column(String(20), default="team", nullable=False)  # team | personal
+    # Compteur des noms par défaut (projet, projet_2, ...), incrémenté par UPDATE ... RETURNING
+    project_name_seq: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     owner_user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
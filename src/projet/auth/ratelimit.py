@@ -0,0 +1,213 @@
+"""Rate limiting des endpoints d'auth: Redis si disponible, sinon token bucket local.
+
+Chaque endpoint a une limite par IP et, quand il porte un identifiant de
+compte (email), une limite par compte. Avec Redis, les compteurs sont des
+fenêtres fixes partagées entre workers (SET NX EX + INCR). Sans Redis, un
+token bucket en mémoire du process, réparti en shards (un verrou chacun) et
+borné en nombre de clés: les clés inactives depuis le plus longtemps sont
+évincées (LRU).
+
+La limite par IP vise le navigateur, pas l'app web qui appelle le service
+auth en serveur à serveur: l'en-tête `X-Forwarded-For` n'est lu que si la
+connexion vient d'un proxy de confiance (RATE_LIMIT_TRUSTED_PROXIES).
+"""
+from __future__ import annotations
+
+import ipaddress
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, status
+
+from projet.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "ratelimit:"
+_REDIS_WARNING_INTERVAL = 60.0  # s entre deux avertissements "Redis indisponible"
+
+
+def parse_networks(value: str) -> tuple:
+    """"127.0.0.1, 172.28.0.0/24" -> réseaux IP (une adresse seule = /32 ou /128)."""
+    return tuple(ipaddress.ip_network(v.strip(), strict=False) for v in (value or "").split(",") if v.strip())
+
+
+@dataclass(frozen=True)
+class Limit:
+    times: int
+    seconds: int
+
+    @classmethod
+    def parse(cls, value: str) -> "Limit | None":
+        """"5/300" -> 5 requêtes par 300 s; vide ou "0" -> pas de limite."""
+        value = (value or "").strip()
+        if not value or value == "0":
+            return None
+        times, _, seconds = value.partition("/")
+        return cls(int(times), int(seconds or 1))
+
+    @property
+    def rate(self) -> float:
+        return self.times / self.seconds
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+
+class LocalTokenBuckets:
+    """Token buckets en mémoire, `shards` verrous indépendants, `max_keys` clés au total."""
+
+    def __init__(self, shards: int = 16, max_keys: int = 100_000):
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._max_per_shard = max(1, max_keys // len(self._shards))
+        self.evictions = 0
+
+    def hit(self, key: str, limit: Limit) -> float:
+        """Consomme un jeton; retourne 0 si autorisé, sinon l'attente en secondes."""
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with shard.lock:
+            tokens, updated = shard.buckets.get(key, (float(limit.times), now))
+            tokens = min(float(limit.times), tokens + (now - updated) * limit.rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / limit.rate
+            shard.buckets[key] = (tokens, now)
+            shard.buckets.move_to_end(key)
+            if len(shard.buckets) > self._max_per_shard:
+                # Clé la moins récemment utilisée: son bucket repartira plein
+                shard.buckets.popitem(last=False)
+                self.evictions += 1
+        return retry_after
+
+    def __len__(self) -> int:
+        return sum(len(s.buckets) for s in self._shards)
+
+
+class AuthRateLimiter:
+    """Applique les limites par IP / par compte de chaque endpoint d'auth."""
+
+    def __init__(
+        self,
+        enabled: bool,
+        rules: dict[str, tuple[Limit | None, Limit | None]],
+        local: LocalTokenBuckets,
+        trusted_proxies: tuple = (),
+    ):
+        self.enabled = enabled
+        self.rules = rules
+        self._local = local
+        self.trusted_proxies = trusted_proxies
+        self._redis = None
+        self._redis_warned_at: float | None = None
+        self.rejected = 0
+        self.redis_errors = 0
+
+    def use_redis(self, client) -> None:
+        self._redis = client
+
+    async def _hit(self, key: str, limit: Limit) -> float:
+        if self._redis is not None:
+            try:
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    pipe.set(key, 0, ex=limit.seconds, nx=True)
+                    pipe.incr(key)
+                    pipe.pttl(key)
+                    _, count, pttl = await pipe.execute()
+                if int(count) <= limit.times:
+                    return 0.0
+                return max(int(pttl), 0) / 1000
+            except Exception as e:
+                self.redis_errors += 1
+                now = time.monotonic()
+                if self._redis_warned_at is None or now - self._redis_warned_at >= _REDIS_WARNING_INTERVAL:
+                    self._redis_warned_at = now
+                    logger.warning("Rate limiting: Redis indisponible, bucket local (%s erreurs): %s", self.redis_errors, e)
+        return self._local.hit(key, limit)
+
+    def _is_trusted(self, host: str) -> bool:
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
+
+    def client_ip(self, request: Request) -> str | None:
+        """IP du client: le pair TCP, ou le dernier saut de `X-Forwarded-For`
+        qui n'est pas un proxy de confiance quand le pair en est un.
+        """
+        peer = request.client.host if request.client else None
+        if peer is None or not self._is_trusted(peer):
+            return peer
+        hops = [h.strip() for h in request.headers.get("x-forwarded-for", "").split(",") if h.strip()]
+        for hop in reversed(hops):
+            if not self._is_trusted(hop):
+                return hop
+        return hops[0] if hops else peer
+
+    async def _enforce(self, key: str, limit: Limit) -> None:
+        retry_after = await self._hit(key, limit)
+        if retry_after > 0:
+            self.rejected += 1
+            raise HTTPException(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "Trop de tentatives, réessayez plus tard",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
+
+    async def check_ip(self, request: Request, scope: str) -> None:
+        """Lève 429 (avec Retry-After) si l'IP dépasse la limite de `scope`."""
+        ip_limit = self.rules.get(scope, (None, None))[0]
+        if not (self.enabled and ip_limit):
+            return
+        ip = self.client_ip(request)
+        if ip:
+            await self._enforce(f"{_KEY_PREFIX}{scope}:ip:{ip}", ip_limit)
+
+    async def check_account(self, scope: str, account: str) -> None:
+        """Lève 429 si le compte (email) dépasse la limite de `scope`."""
+        account_limit = self.rules.get(scope, (None, None))[1]
+        if self.enabled and account_limit and account:
+            await self._enforce(f"{_KEY_PREFIX}{scope}:account:{account.strip().lower()}", account_limit)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": "redis" if self._redis is not None else "local",
+            "rejected": self.rejected,
+            "local_keys": len(self._local),
+            "local_evictions": self._local.evictions,
+            "redis_errors": self.redis_errors,
+        }
+
+
+rate_limiter = AuthRateLimiter(
+    enabled=settings.RATE_LIMIT_ENABLED,
+    rules={
+        "register": (Limit.parse(settings.RATE_LIMIT_REGISTER_IP), None),
+        "login": (Limit.parse(settings.RATE_LIMIT_LOGIN_IP), Limit.parse(settings.RATE_LIMIT_LOGIN_ACCOUNT)),
+        "refresh": (Limit.parse(settings.RATE_LIMIT_REFRESH_IP), None),
+        "password_reset": (Limit.parse(settings.RATE_LIMIT_RESET_IP), None),
+    },
+    local=LocalTokenBuckets(shards=settings.RATE_LIMIT_LOCAL_SHARDS, max_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS),
+    trusted_proxies=parse_networks(settings.RATE_LIMIT_TRUSTED_PROXIES),
+)
+
+
+def rate_limit(scope: str):
+    """Dépendance FastAPI: limite par IP de `scope` (utilisable sur les routes sync)."""
+
+    async def dependency(request: Request) -> None:
+        await rate_limiter.check_ip(request, scope)
+
+    return dependency
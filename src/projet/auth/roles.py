@@ -0,0 +1,118 @@
+"""Cache process des rôles (table quasi statique, seedée par la migration 0003).
+
+Les correspondances nom -> id et id -> nom sont chargées en une requête puis
+servies depuis la mémoire. Les scripts d'admin qui modifient les rôles
+appellent `bump_version(db)`: chaque process le voit au plus tard après
+ROLE_CACHE_CHECK_INTERVAL secondes (une requête sur `cache_versions`), et
+un id ou un nom inconnu déclenche un rechargement immédiat.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from projet.settings import settings
+
+_VERSION_NAME = "roles"
+
+
+class RoleCache:
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._ids: dict[str, int] = {}
+        self._names: dict[int, str] = {}
+        self._version: int | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    @staticmethod
+    def _db_version(db: Session) -> int:
+        version = db.scalar(select(models.CacheVersion.version).where(models.CacheVersion.name == _VERSION_NAME))
+        return version or 0
+
+    def _load(self, db: Session) -> None:
+        version = self._db_version(db)
+        rows = db.execute(select(models.Role.id, models.Role.name)).all()
+        with self._lock:
+            self._ids = {name: role_id for role_id, name in rows}
+            self._names = {role_id: name for role_id, name in rows}
+            self._version = version
+            self._checked_at = time.monotonic()
+            self.loads += 1
+
+    def _ensure_fresh(self, db: Session) -> None:
+        if self._version is None:
+            self._load(db)
+        elif time.monotonic() - self._checked_at >= self.check_interval:
+            if self._db_version(db) != self._version:
+                self._load(db)
+            else:
+                self._checked_at = time.monotonic()
+
+    def role_id(self, db: Session, name: str, create: bool = False) -> int | None:
+        self._ensure_fresh(db)
+        if name not in self._ids:
+            self._load(db)
+        cached = self._ids.get(name)
+        if cached is not None or not create:
+            return cached
+        # Rôle absent: créé dans la transaction de l'appelant (flush). Il n'est
+        # pas mis en cache ici: un rollback ne laisse donc pas d'id fantôme.
+        role = models.Role(name=name)
+        db.add(role)
+        db.flush()
+        return role.id
+
+    def role_names(self, db: Session, role_ids: list[int]) -> list[str]:
+        self._ensure_fresh(db)
+        if any(role_id not in self._names for role_id in role_ids):
+            self._load(db)
+        return [self._names[role_id] for role_id in role_ids if role_id in self._names]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids, self._names, self._version = {}, {}, None
+
+    def stats(self) -> dict:
+        return {"roles": len(self._ids), "version": self._version, "loads": self.loads}
+
+
+role_cache = RoleCache(check_interval=settings.ROLE_CACHE_CHECK_INTERVAL)
+
+
+def role_id(db: Session, name: str, create: bool = False) -> int | None:
+    """Id du rôle `name` (créé dans la transaction en cours si `create`)."""
+    return role_cache.role_id(db, name, create=create)
+
+
+def user_role_names(db: Session, user_id: int) -> list[str]:
+    """Noms des rôles d'un utilisateur: une requête sur `user_roles`, aucune sur `roles`."""
+    role_ids = db.scalars(
+        select(models.UserRole.role_id).where(models.UserRole.user_id == user_id).order_by(models.UserRole.role_id)
+    ).all()
+    return role_cache.role_names(db, list(role_ids))
+
+
+def bump_version(db: Session) -> None:
+    """À appeler (avant commit) après toute création/renommage/suppression de rôle."""
+    bumped = db.execute(
+        update(models.CacheVersion)
+        .where(models.CacheVersion.name == _VERSION_NAME)
+        .values(version=models.CacheVersion.version + 1)
+    )
+    if bumped.rowcount == 0:
+        db.add(models.CacheVersion(name=_VERSION_NAME, version=1))
+    role_cache.clear()
+
+
+def clear() -> None:
+    role_cache.clear()
+
+
+# Table recréée (tests, reset de base): les ids en cache ne valent plus rien
+event.listen(models.Role.__table__, "after_drop", lambda *args, **kwargs: clear())
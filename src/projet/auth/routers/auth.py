@@ -1,19 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi_limiter import FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
+from uuid import uuid4
 from jwt.exceptions import InvalidTokenError
-from .. import schemas, models, security
+from .. import schemas, models, roles, security
 from ..database import get_db
+from ..last_login import last_login_recorder
+from ..lockout import login_lockout
+from ..ratelimit import rate_limit, rate_limiter
 from ...settings import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 def ensure_personal_organization(db: Session, user: models.User) -> models.Organization:
-    """Crée (si besoin) l'organisation perso d'un utilisateur."""
+    """Crée (si besoin) l'organisation perso d'un utilisateur.
+
+    Se contente d'un flush: le commit revient à l'appelant, dans la même
+    transaction que le reste de son travail. `user.personal_organization_id`
+    est renseigné au passage (comptes antérieurs à la migration 0005).
+    """
+    if user.personal_organization_id:
+        org = db.get(models.Organization, user.personal_organization_id)
+        if org is not None:
+            return org
+
     existing = (
         db.query(models.Organization)
         .join(models.OrganizationUser, models.OrganizationUser.organization_id == models.Organization.id)
@@ -24,6 +39,7 @@ def ensure_personal_organization(db: Session, user: models.User) -> models.Organ
         .first()
     )
     if existing:
+        user.personal_organization_id = existing.id
         return existing
 
     org = models.Organization(
@@ -32,8 +48,7 @@ def ensure_personal_organization(db: Session, user: models.User) -> models.Organ
         owner_user_id=user.id,
     )
     db.add(org)
-    db.commit()
-    db.refresh(org)
+    db.flush()
 
     link = models.OrganizationUser(
         user_id=user.id,
@@ -41,59 +56,125 @@ def ensure_personal_organization(db: Session, user: models.User) -> models.Organ
         role="owner",
     )
     db.add(link)
-    db.commit()
-    db.refresh(org)
+    user.personal_organization_id = org.id
+    db.flush()
     return org
 
-@router.post("/register", response_model=schemas.UserOut, status_code=201)
+def _email_registered(db: Session, email: str) -> bool:
+    return db.query(models.User).filter_by(email=email).first() is not None
+
+
+def _create_user(
+    db: Session,
+    user: schemas.UserCreate,
+    hashed_password: str,
+    verification_token: str,
+) -> models.User:
+    u = models.User(
+        email=user.email, 
+        hashed_password=hashed_password,
+        email_verification_token=verification_token,
+        first_name=user.first_name,
+        last_name=user.last_name
+    )
+    # Une seule transaction: utilisateur, rôle "user", org perso et appartenance
+    try:
+        db.add(u)
+        db.flush()
+        db.add(models.UserRole(user_id=u.id, role_id=roles.role_id(db, "user", create=True)))
+        ensure_personal_organization(db, u)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(u)
+    return u
+
+
+@router.post("/register", response_model=schemas.UserOut, status_code=201, dependencies=[Depends(rate_limit("register"))])
 async def register(
     user: schemas.UserCreate, 
     db: Session = Depends(get_db),
     request: Request = None
 ):
-    # Rate limiting (désactivé temporairement)
-    # if request:
-    #     await FastAPILimiter.check(request, RateLimiter(times=5, seconds=300))  # 5 tentatives par 5 min
-    
-    if db.query(models.User).filter_by(email=user.email).first():
+    # Les accès DB (synchrones) passent par le threadpool pour ne pas bloquer la boucle
+    if await run_in_threadpool(_email_registered, db, user.email):
         raise HTTPException(400, "Email already registered")
     
     # Créer l'utilisateur avec token de vérification
     verification_token = security.create_email_verification_token(user.email)
-    u = models.User(
-        email=user.email, 
-        hashed_password=security.hash_password(user.password),
-        email_verification_token=verification_token,
-        first_name=user.first_name,
-        last_name=user.last_name
-    )
-    db.add(u); db.commit(); db.refresh(u)
-    
-    # Assigner rôle par défaut "user"
-    role = db.query(models.Role).filter_by(name="user").first()
-    if not role:
-        role = models.Role(name="user")
-        db.add(role); db.commit(); db.refresh(role)
-    link = models.UserRole(user_id=u.id, role_id=role.id)
-    db.add(link); db.commit()
-    ensure_personal_organization(db, u)
+    hashed_password = await security.hash_password_async(user.password)
+    u = await run_in_threadpool(_create_user, db, user, hashed_password, verification_token)
     
     # TODO: Envoyer email de vérification
     print(f"Email de vérification pour {user.email}: {verification_token}")
     
     return u
 
-@router.post("/login", response_model=schemas.Token)
+
+def _find_user_by_email(db: Session, email: str) -> models.User | None:
+    return db.query(models.User).filter_by(email=email).first()
+
+
+def _lock_account(db: Session, u: models.User, attempts: int) -> None:
+    u.failed_login_attempts = attempts
+    u.locked_until = datetime.utcnow() + timedelta(minutes=settings.LOGIN_LOCKOUT_MINUTES)
+    db.commit()
+
+
+def _issue_refresh_token(db: Session, user_id: int, family_id: str) -> str:
+    """Crée un refresh token et ajoute son hash à la session (sans commit)."""
+    refresh_token = security.create_refresh_token(str(user_id))
+    db.add(models.RefreshToken(
+        token_hash=security.hash_refresh_token(refresh_token),
+        user_id=user_id,
+        family_id=family_id,
+        expires_at=datetime.utcnow() + timedelta(days=7)
+    ))
+    return refresh_token
+
+
+def _complete_login(db: Session, u: models.User) -> dict:
+    """Tokens + écritures du login réussi, en une seule transaction."""
+    # Noms des rôles via le cache: pas de jointure sur `roles`
+    role_names = roles.user_role_names(db, u.id)
+    access_token = security.create_access_token(str(u.id), roles=role_names, email=u.email)
+    now = datetime.utcnow()
+
+    # Reset des tentatives échouées (sans UPDATE si déjà à zéro)
+    if u.failed_login_attempts:
+        u.failed_login_attempts = 0
+    if u.locked_until is not None:
+        u.locked_until = None
+    if last_login_recorder.enabled:
+        last_login_recorder.record(u.id, now)
+    else:
+        u.last_login = now
+    # Org perso créée à l'inscription: seuls les comptes anciens passent ici
+    if u.personal_organization_id is None:
+        ensure_personal_organization(db, u)
+
+    # Nouvelle famille de refresh tokens (une par login)
+    refresh_token = _issue_refresh_token(db, u.id, family_id=str(uuid4()))
+    db.commit()
+    
+    return {
+        "access_token": access_token, 
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+
+@router.post("/login", response_model=schemas.Token, dependencies=[Depends(rate_limit("login"))])
 async def login(
     form: OAuth2PasswordRequestForm = Depends(), 
     db: Session = Depends(get_db),
     request: Request = None
 ):
-    # Rate limiting (désactivé temporairement)
-    # if request:
-    #     await FastAPILimiter.check(request, RateLimiter(times=5, seconds=300))  # 5 tentatives par 5 min
+    await rate_limiter.check_account("login", form.username)
     
-    u = db.query(models.User).filter_by(email=form.username).first()  # OAuth2PasswordRequestForm utilise 'username' pour l'email
+    u = await run_in_threadpool(_find_user_by_email, db, form.username)  # OAuth2PasswordRequestForm utilise 'username' pour l'email
     
     # Debug: Log de la tentative de connexion
     print(f"🔐 Tentative de connexion pour: {form.username}")
@@ -103,45 +184,40 @@ async def login(
     if u and u.locked_until and u.locked_until > datetime.utcnow():
         raise HTTPException(status.HTTP_423_LOCKED, "Account temporarily locked")
     
-    if not u or not security.verify_password(form.password, u.hashed_password):
-        # Incrémenter les tentatives échouées
+    if not u or not await security.verify_password_async(form.password, u.hashed_password):
+        # Échecs comptés dans Redis (ou en mémoire): la DB n'est écrite qu'au verrouillage
         if u:
-            u.failed_login_attempts += 1
-            if u.failed_login_attempts >= 5:
-                u.locked_until = datetime.utcnow() + timedelta(minutes=30)
-            db.commit()
+            attempts = await login_lockout.register_failure(u.email)
+            if attempts >= login_lockout.max_attempts:
+                await run_in_threadpool(_lock_account, db, u, attempts)
+                await login_lockout.reset(u.email)
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
     
-    # Reset des tentatives échouées et mise à jour du dernier login
-    u.failed_login_attempts = 0
-    u.locked_until = None
-    u.last_login = datetime.utcnow()
-    db.commit()
-    ensure_personal_organization(db, u)
-    
-    roles = [r.name for r in u.roles]
-    access_token = security.create_access_token(str(u.id), roles=roles)
-    refresh_token = security.create_refresh_token(str(u.id))
-    
-    # Stocker le refresh token hashé
-    refresh_token_hash = security.hash_refresh_token(refresh_token)
-    refresh_token_obj = models.RefreshToken(
-        token_hash=refresh_token_hash,
-        user_id=u.id,
-        expires_at=datetime.utcnow() + timedelta(days=7)
-    )
-    db.add(refresh_token_obj)
-    db.commit()
-    
-    return {
-        "access_token": access_token, 
-        "refresh_token": refresh_token,
-        "token_type": "bearer",
-        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    }
+    await login_lockout.reset(u.email)
+    return await run_in_threadpool(_complete_login, db, u)
+
+def _revoke_family_on_replay(db: Session, token_hash: str) -> None:
+    """Token déjà tourné présenté à nouveau: toute sa famille est révoquée.
+
+    Le token légitime et son voleur présumé doivent alors se reconnecter.
+    """
+    replayed = db.execute(
+        select(models.RefreshToken.family_id).where(
+            models.RefreshToken.token_hash == token_hash,
+            models.RefreshToken.is_revoked.is_(True),
+        )
+    ).first()
+    if replayed is not None and replayed.family_id:
+        db.execute(
+            update(models.RefreshToken)
+            .where(models.RefreshToken.family_id == replayed.family_id, models.RefreshToken.is_revoked.is_(False))
+            .values(is_revoked=True)
+        )
+        db.commit()
 
-@router.post("/refresh", response_model=schemas.Token)
-async def refresh_token(
+
+@router.post("/refresh", response_model=schemas.Token, dependencies=[Depends(rate_limit("refresh"))])
+def refresh_token(
     request: schemas.RefreshTokenRequest,
     db: Session = Depends(get_db)
 ):
@@ -154,36 +230,36 @@ async def refresh_token(
         if not user_id:
             raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token")
         
-        # Vérifier que le refresh token existe et n'est pas révoqué
+        # Rotation: un seul UPDATE indexé révoque le token présenté s'il est encore valide
         token_hash = security.hash_refresh_token(request.refresh_token)
-        refresh_token_obj = db.query(models.RefreshToken).filter_by(
-            token_hash=token_hash, 
-            is_revoked=False
+        rotated = db.execute(
+            update(models.RefreshToken)
+            .where(
+                models.RefreshToken.token_hash == token_hash,
+                models.RefreshToken.is_revoked.is_(False),
+                models.RefreshToken.expires_at > datetime.utcnow(),
+            )
+            .values(is_revoked=True)
+            .returning(models.RefreshToken.user_id, models.RefreshToken.family_id)
         ).first()
         
-        if not refresh_token_obj or refresh_token_obj.expires_at < datetime.utcnow():
+        if rotated is None:
+            _revoke_family_on_replay(db, token_hash)
             raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid or expired refresh token")
         
-        # Révoker l'ancien refresh token
-        refresh_token_obj.is_revoked = True
-        
-        # Créer de nouveaux tokens
-        u = db.query(models.User).filter_by(id=int(user_id)).first()
+        u = (
+            db.query(models.User)
+            .filter(models.User.id == rotated.user_id, models.User.is_active.is_(True))
+            .first()
+        )
         if not u:
+            db.rollback()
             raise HTTPException(status.HTTP_401_UNAUTHORIZED, "User not found")
         
-        roles = [r.name for r in u.roles]
-        new_access_token = security.create_access_token(str(u.id), roles=roles)
-        new_refresh_token = security.create_refresh_token(str(u.id))
-        
-        # Stocker le nouveau refresh token
-        new_refresh_token_hash = security.hash_refresh_token(new_refresh_token)
-        new_refresh_token_obj = models.RefreshToken(
-            token_hash=new_refresh_token_hash,
-            user_id=u.id,
-            expires_at=datetime.utcnow() + timedelta(days=7)
-        )
-        db.add(new_refresh_token_obj)
+        role_names = roles.user_role_names(db, u.id)
+        new_access_token = security.create_access_token(str(u.id), roles=role_names, email=u.email)
+        # Le nouveau token reste dans la famille du précédent
+        new_refresh_token = _issue_refresh_token(db, u.id, family_id=rotated.family_id or str(uuid4()))
         db.commit()
         
         return {
@@ -197,7 +273,7 @@ async def refresh_token(
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token")
 
 @router.post("/verify-email")
-async def verify_email(
+def verify_email(
     request: schemas.EmailVerification,
     db: Session = Depends(get_db)
 ):
@@ -221,8 +297,8 @@ async def verify_email(
     except InvalidTokenError:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid or expired token")
 
-@router.post("/request-password-reset")
-async def request_password_reset(
+@router.post("/request-password-reset", dependencies=[Depends(rate_limit("password_reset"))])
+def request_password_reset(
     request: schemas.PasswordResetRequest,
     db: Session = Depends(get_db)
 ):
@@ -240,7 +316,28 @@ async def request_password_reset(
     # Toujours retourner 200 pour éviter l'énumération d'emails
     return {"message": "If the email exists, a reset link has been sent"}
 
-@router.post("/reset-password")
+def _find_reset_user(db: Session, email: str, token: str) -> models.User | None:
+    return db.query(models.User).filter_by(
+        email=email,
+        password_reset_token=token
+    ).first()
+
+
+def _apply_password_reset(db: Session, user: models.User, hashed_password: str) -> None:
+    # Mettre à jour le mot de passe
+    user.hashed_password = hashed_password
+    user.password_reset_token = None
+    user.password_reset_expires = None
+    user.failed_login_attempts = 0
+    user.locked_until = None
+    
+    # Révoker tous les refresh tokens
+    db.query(models.RefreshToken).filter_by(user_id=user.id).update({"is_revoked": True})
+    
+    db.commit()
+
+
+@router.post("/reset-password", dependencies=[Depends(rate_limit("password_reset"))])
 async def reset_password(
     request: schemas.PasswordReset,
     db: Session = Depends(get_db)
@@ -251,25 +348,13 @@ async def reset_password(
             raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid token type")
         
         email = payload.get("email")
-        user = db.query(models.User).filter_by(
-            email=email,
-            password_reset_token=request.token
-        ).first()
+        user = await run_in_threadpool(_find_reset_user, db, email, request.token)
         
         if not user or user.password_reset_expires < datetime.utcnow():
             raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid or expired token")
         
-        # Mettre à jour le mot de passe
-        user.hashed_password = security.hash_password(request.new_password)
-        user.password_reset_token = None
-        user.password_reset_expires = None
-        user.failed_login_attempts = 0
-        user.locked_until = None
-        
-        # Révoker tous les refresh tokens
-        db.query(models.RefreshToken).filter_by(user_id=user.id).update({"is_revoked": True})
-        
-        db.commit()
+        hashed_password = await security.hash_password_async(request.new_password)
+        await run_in_threadpool(_apply_password_reset, db, user, hashed_password)
         
         return {"message": "Password reset successfully"}
         
@@ -277,21 +362,17 @@ async def reset_password(
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid or expired token")
 
 @router.get("/me", response_model=schemas.UserOut)
-async def get_current_user(current_user: models.User = Depends(security.get_current_user)):
+def get_current_user(current_user: models.User = Depends(security.get_current_user)):
     return current_user
 
 
 @router.get("/projects", response_model=list[schemas.ProjectOut])
-async def list_projects(
+def list_projects(
     current_user: models.User = Depends(security.get_current_user),
     db: Session = Depends(get_db),
     organization_id: str | None = Header(default=None),
 ):
     """Retourne la liste des projets associés à l'utilisateur courant."""
-    # Utilise la relation many-to-many définie sur User.projects
-    user = db.query(models.User).filter_by(id=current_user.id).first()
-    if not user:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "User not found")
     projects = (
         db.query(models.Project)
         .join(models.ProjectUser, models.ProjectUser.project_id == models.Project.id)
@@ -303,7 +384,7 @@ async def list_projects(
 
 
 @router.get("/projects/{project_id}", response_model=schemas.ProjectOut)
-async def get_project(
+def get_project(
     project_id: str,
     current_user: models.User = Depends(security.get_current_user),
     db: Session = Depends(get_db),
@@ -327,7 +408,7 @@ async def get_project(
 
 
 @router.patch("/projects/{project_id}", response_model=schemas.ProjectOut)
-async def update_project(
+def update_project(
     project_id: str,
     update: schemas.ProjectUpdate,
     current_user: models.User = Depends(security.get_current_user),
@@ -351,13 +432,17 @@ async def update_project(
 
     if update.name:
         project.name = update.name
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status.HTTP_409_CONFLICT, "A project with this name already exists")
     db.refresh(project)
     return project
 
 
 @router.delete("/projects/{project_id}", status_code=204)
-async def delete_project(
+def delete_project(
     project_id: str,
     current_user: models.User = Depends(security.get_current_user),
     db: Session = Depends(get_db),
@@ -383,8 +468,23 @@ async def delete_project(
     return
 
 
+_DEFAULT_PROJECT_NAME = "projet"
+_DEFAULT_NAME_ATTEMPTS = 5
+
+
+def _next_default_project_name(db: Session, organization_id: str) -> str:
+    """projet, projet_2, projet_3, ... via le compteur de l'organisation (une requête)."""
+    seq = db.execute(
+        update(models.Organization)
+        .where(models.Organization.id == organization_id)
+        .values(project_name_seq=models.Organization.project_name_seq + 1)
+        .returning(models.Organization.project_name_seq)
+    ).scalar_one()
+    return _DEFAULT_PROJECT_NAME if seq == 1 else f"{_DEFAULT_PROJECT_NAME}_{seq}"
+
+
 @router.post("/projects", response_model=schemas.ProjectOut, status_code=201)
-async def create_project(
+def create_project(
     project: schemas.ProjectCreate,
     current_user: models.User = Depends(security.get_current_user),
     db: Session = Depends(get_db),
@@ -394,13 +494,8 @@ async def create_project(
 
     Si aucun nom n'est fourni, génère un nom par défaut:
     projet, projet_2, projet_3, ...
-    (par utilisateur).
+    (par organisation, unicité garantie par uq_project_organization_name).
     """
-    # Récupérer tous les projets de l'utilisateur pour calculer le prochain nom
-    user = db.query(models.User).filter_by(id=current_user.id).first()
-    if not user:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "User not found")
-
     # Déterminer l'organisation cible (active)
     if organization_id:
         org = (
@@ -415,34 +510,30 @@ async def create_project(
         if not org:
             raise HTTPException(status.HTTP_403_FORBIDDEN, "Organization access denied")
     else:
-        org = ensure_personal_organization(db, user)
-
-    base_name = "projet"
-    if project.name:
-        final_name = project.name
+        org = ensure_personal_organization(db, current_user)
+
+    attempts = 1 if project.name else _DEFAULT_NAME_ATTEMPTS
+    for _ in range(attempts):
+        name = project.name or _next_default_project_name(db, org.id)
+        new_project = models.Project(
+            name=name,
+            description=project.description,
+            organization_id=org.id,
+        )
+        try:
+            # Savepoint: un nom déjà pris (ex. "projet_3" saisi à la main) n'annule pas le compteur
+            with db.begin_nested():
+                db.add(new_project)
+                db.flush()
+            break
+        except IntegrityError:
+            continue
     else:
-        existing_names = {
-            p.name for p in user.projects if p.organization_id == org.id
-        }
-        final_name = base_name
-        if final_name in existing_names:
-            i = 2
-            while f"{base_name}_{i}" in existing_names:
-                i += 1
-            final_name = f"{base_name}_{i}"
-
-    new_project = models.Project(
-        name=final_name,
-        description=project.description,
-        organization_id=org.id,
-    )
-    db.add(new_project)
-    db.commit()
-    db.refresh(new_project)
+        db.rollback()
+        raise HTTPException(status.HTTP_409_CONFLICT, "A project with this name already exists")
 
-    # Associer le projet à l'utilisateur courant
-    link = models.ProjectUser(user_id=current_user.id, project_id=new_project.id)
-    db.add(link)
+    # Associer le projet à l'utilisateur courant (même transaction)
+    db.add(models.ProjectUser(user_id=current_user.id, project_id=new_project.id))
     db.commit()
     db.refresh(new_project)
 
@@ -450,7 +541,7 @@ async def create_project(
 
 
 @router.get("/organizations", response_model=list[schemas.OrganizationOut])
-async def list_organizations(
+def list_organizations(
     current_user: models.User = Depends(security.get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -474,8 +565,69 @@ async def list_organizations(
     return result
 
 
+@router.get("/context", response_model=schemas.PageContextOut)
+def page_context(
+    user: models.User = Depends(security.current_user_loader("context")),
+    db: Session = Depends(get_db),
+    organization_id: str | None = Header(default=None),
+    include_projects: bool = True,
+    project_id: str | None = None,
+):
+    """Contexte d'une page SSR en un seul appel: utilisateur, organisations,
+    organisation active (en-tête `organization-id` si membre, sinon la première)
+    et projets de l'organisation active (ou un seul projet via `project_id`).
+    """
+    rows = (
+        db.query(models.Organization, models.OrganizationUser.role)
+        .join(models.OrganizationUser, models.OrganizationUser.organization_id == models.Organization.id)
+        .filter(models.OrganizationUser.user_id == user.id)
+        .all()
+    )
+    organizations = [
+        schemas.OrganizationOut(
+            id=org.id,
+            name=org.name,
+            org_type=org.org_type,
+            owner_user_id=org.owner_user_id,
+            role=role,
+        )
+        for org, role in rows
+    ]
+    active = next((o for o in organizations if o.id == organization_id), None)
+    if active is None and organizations:
+        active = organizations[0]
+
+    projects: list[models.Project] = []
+    project = None
+    if include_projects or project_id:
+        query = (
+            db.query(models.Project)
+            .join(models.ProjectUser, models.ProjectUser.project_id == models.Project.id)
+            .filter(models.ProjectUser.user_id == user.id)
+        )
+        if active is not None:
+            query = query.filter(models.Project.organization_id == active.id)
+        if project_id:
+            project = query.filter(models.Project.id == project_id).first()
+        else:
+            projects = query.all()
+
+    return schemas.PageContextOut(
+        user=schemas.ContextUser(
+            id=user.id,
+            email=user.email,
+            is_verified=user.is_verified,
+            roles=[r.name for r in user.roles],
+        ),
+        organizations=organizations,
+        active_organization=active,
+        projects=projects,
+        project=project,
+    )
+
+
 @router.post("/organizations", response_model=schemas.OrganizationOut, status_code=201)
-async def create_organization(
+def create_organization(
     payload: schemas.OrganizationCreate,
     current_user: models.User = Depends(security.get_current_user),
     db: Session = Depends(get_db),
@@ -507,7 +659,7 @@ async def create_organization(
 
 
 @router.post("/organizations/select", response_model=schemas.OrganizationOut)
-async def select_organization(
+def select_organization(
     payload: schemas.OrganizationSelect,
     current_user: models.User = Depends(security.get_current_user),
     db: Session = Depends(get_db),
@@ -533,7 +685,7 @@ async def select_organization(
     )
 
 @router.put("/me", response_model=schemas.UserOut)
-async def update_current_user(
+def update_current_user(
     user_update: schemas.UserUpdate,
     current_user: models.User = Depends(security.get_current_user),
     db: Session = Depends(get_db)
@@ -559,11 +711,11 @@ async def change_password(
     db: Session = Depends(get_db)
 ):
     # Vérifier le mot de passe actuel
-    if not security.verify_password(password_change.current_password, current_user.hashed_password):
+    if not await security.verify_password_async(password_change.current_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Mot de passe actuel incorrect")
     
     # Mettre à jour le mot de passe
-    current_user.hashed_password = security.hash_password(password_change.new_password)
-    db.commit()
+    current_user.hashed_password = await security.hash_password_async(password_change.new_password)
+    await run_in_threadpool(db.commit)
     
     return {"message": "Mot de passe changé avec succès"}
\ No newline at end of file
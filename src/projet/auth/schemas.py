@@ -138,4 +138,19 @@ class OrganizationOut(BaseModel):
 
 
 class OrganizationSelect(BaseModel):
-    organization_id: str
\ No newline at end of file
+    organization_id: str
+
+class ContextUser(BaseModel):
+    id: int
+    email: EmailStr
+    is_verified: bool
+    roles: list[str] = []
+
+
+class PageContextOut(BaseModel):
+    """Tout ce dont une page SSR a besoin, en une seule réponse."""
+    user: ContextUser
+    organizations: list[OrganizationOut]
+    active_organization: Optional[OrganizationOut] = None
+    projects: list[ProjectOut] = []
+    project: Optional[ProjectOut] = None
@@ -0,0 +1,80 @@
+"""Profil SQLite "production": WAL, pragmas et écritures sérialisées par process.
+
+Activé avec SQLITE_PROFILE=production pour une base fichier. Les lectures
+utilisent le pool de connexions habituel; toute session qui écrit (flush,
+UPDATE/DELETE en masse) prend d'abord un verrou d'écriture unique, rendu au
+commit ou au rollback. Les writers d'un même process passent donc un par un
+au lieu de se battre pour le verrou SQLite ("database is locked"); entre
+process (plusieurs workers uvicorn), `busy_timeout` prend le relais.
+"""
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from projet.settings import settings
+
+_LOCK_KEY = "sqlite_write_lock"
+
+
+def _set_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+        # Valeur négative = taille en KiB
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_MB) * 1024}")
+    finally:
+        cursor.close()
+
+
+class WriteSerializer:
+    """Verrou d'écriture unique partagé par toutes les sessions du process."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+
+    def acquire(self, session: Session) -> None:
+        if session.info.get(_LOCK_KEY):
+            return
+        if not self._lock.acquire(timeout=self.timeout):
+            raise TimeoutError("SQLite: verrou d'écriture non obtenu (database is locked)")
+        session.info[_LOCK_KEY] = True
+        self.acquisitions += 1
+
+    def release(self, session: Session) -> None:
+        # threading.Lock peut être relâché depuis un autre thread (get_db ferme
+        # la session dans un thread du pool différent de celui de la route).
+        if session.info.pop(_LOCK_KEY, False):
+            self._lock.release()
+
+    def install(self, session_factory: sessionmaker) -> None:
+        @event.listens_for(session_factory, "before_flush")
+        def _before_flush(session, flush_context, instances):
+            self.acquire(session)
+
+        @event.listens_for(session_factory, "do_orm_execute")
+        def _before_bulk_write(orm_execute_state):
+            if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+                self.acquire(orm_execute_state.session)
+
+        # Fin de la transaction racine (commit, rollback ou close): on rend le verrou
+        @event.listens_for(session_factory, "after_transaction_end")
+        def _after_transaction_end(session, transaction):
+            if transaction.parent is None:
+                self.release(session)
+
+
+def apply_sqlite_profile(engine: Engine, session_factory: sessionmaker) -> WriteSerializer:
+    """Active pragmas et sérialisation des écritures sur `engine`/`session_factory`."""
+    event.listen(engine, "connect", _set_pragmas)
+    serializer = WriteSerializer(timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000)
+    serializer.install(session_factory)
+    return serializer
@@ -0,0 +1,88 @@
+"""Purge des refresh tokens expirés (CLI + tâche de fond optionnelle)."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from starlette.concurrency import run_in_threadpool
+
+from . import models
+from .database import SessionLocal
+from projet.settings import settings
+
+
+def purge_refresh_tokens(
+    batch_size: int = 1000,
+    now: datetime | None = None,
+    max_batches: int | None = None,
+) -> int:
+    """Supprime par lots les tokens expirés.
+
+    Chaque lot est une transaction courte (DELETE ... WHERE id IN (<= batch_size ids)):
+    pas de verrou long sur la table pendant que les logins continuent. Les
+    tokens révoqués sont conservés jusqu'à leur expiration: tant que le JWT
+    est valide, son rejeu doit retrouver la ligne pour révoquer la famille.
+    Retourne le nombre de lignes supprimées.
+    """
+    now = now or datetime.utcnow()
+    condition = models.RefreshToken.expires_at < now
+    deleted = batches = 0
+    db = SessionLocal()
+    try:
+        while max_batches is None or batches < max_batches:
+            ids = db.scalars(select(models.RefreshToken.id).where(condition).limit(batch_size)).all()
+            if not ids:
+                break
+            db.execute(delete(models.RefreshToken).where(models.RefreshToken.id.in_(ids)))
+            db.commit()
+            deleted += len(ids)
+            batches += 1
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return deleted
+
+
+class RefreshTokenPurger:
+    """Lance `purge_refresh_tokens` toutes les `interval` secondes (0 = désactivé)."""
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.deleted = 0
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.deleted += await run_in_threadpool(purge_refresh_tokens, self.batch_size)
+                self.runs += 1
+            except Exception as e:
+                print(f"⚠️ Purge des refresh tokens: {e}")
+
+    def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {"interval": self.interval, "runs": self.runs, "deleted": self.deleted}
+
+
+refresh_token_purger = RefreshTokenPurger(
+    interval=settings.REFRESH_TOKEN_PURGE_INTERVAL,
+    batch_size=settings.REFRESH_TOKEN_PURGE_BATCH_SIZE,
+)
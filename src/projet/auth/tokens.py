@@ -0,0 +1,176 @@
+"""Émission et vérification des JWT (clés en cache, rotation par `kid`).
+
+Sans dépendance à la base de données: l'app web importe ce module pour
+vérifier localement le token de session sans construire le moteur
+SQLAlchemy du service auth.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+import jwt
+from jwt.exceptions import InvalidTokenError
+import os
+import secrets
+import hashlib
+import threading
+import time
+from cryptography.hazmat.primitives import serialization
+
+from projet.settings import settings
+
+ALGORITHM = settings.JWT_ALGORITHM
+
+def _read_file(p: str) -> str:
+    return Path(p).read_text(encoding="utf-8")
+
+
+class _CachedKey:
+    """Clé PEM déjà parsée, avec le mtime du fichier d'origine."""
+
+    __slots__ = ("mtime", "checked_at", "key", "kid")
+
+    def __init__(self, mtime: int, checked_at: float, key, kid: str):
+        self.mtime = mtime
+        self.checked_at = checked_at
+        self.key = key
+        self.kid = kid
+
+
+_key_cache: dict[str, _CachedKey] = {}
+_key_lock = threading.Lock()
+_hs_secret: Optional[str] = None
+
+
+def _key_id(public_key) -> str:
+    """Identifiant (`kid`) stable dérivé de la clé publique (empreinte SHA-256)."""
+    der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return hashlib.sha256(der).hexdigest()[:16]
+
+
+def _load_pem(path: str, private: bool) -> _CachedKey:
+    """Charge une clé PEM une seule fois; relit le fichier uniquement si son mtime change
+    (vérifié au plus toutes les JWT_KEY_CHECK_INTERVAL secondes)."""
+    now = time.monotonic()
+    cached = _key_cache.get(path)
+    if cached is not None and now - cached.checked_at < settings.JWT_KEY_CHECK_INTERVAL:
+        return cached
+    with _key_lock:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            kind = "PRIVATE_KEY_PATH" if private else "PUBLIC_KEY_PATH"
+            raise RuntimeError(f"{kind} introuvable pour clés asymétriques: {path}")
+        if cached is not None and cached.mtime == mtime:
+            cached.checked_at = now
+            return cached
+        pem = _read_file(path).encode()
+        if private:
+            key = serialization.load_pem_private_key(pem, password=None)
+            kid = _key_id(key.public_key())
+        else:
+            key = serialization.load_pem_public_key(pem)
+            kid = _key_id(key)
+        entry = _CachedKey(mtime, now, key, kid)
+        _key_cache[path] = entry
+        return entry
+
+
+def reload_keys() -> None:
+    """Oublie les clés en cache (rotation manuelle); elles seront relues au prochain usage."""
+    global _hs_secret
+    with _key_lock:
+        _key_cache.clear()
+        _hs_secret = None
+
+
+def _hs256_secret() -> str:
+    global _hs_secret
+    if _hs_secret is None:
+        secret_key = settings.SECRET_KEY
+        if hasattr(secret_key, 'get_secret_value'):
+            secret_key = secret_key.get_secret_value()
+        if not secret_key or len(secret_key) < 32:
+            raise RuntimeError("SECRET_KEY manquant ou trop court (>=32 chars) pour HS256")
+        _hs_secret = secret_key
+    return _hs_secret
+
+
+def _signing_key() -> _CachedKey:
+    if not settings.PRIVATE_KEY_PATH:
+        raise RuntimeError("PRIVATE_KEY_PATH introuvable pour clés asymétriques")
+    return _load_pem(settings.PRIVATE_KEY_PATH, private=True)
+
+
+def _verifying_keys() -> dict[str, object]:
+    """Clés publiques actives indexées par `kid` (clé courante + clés de rotation)."""
+    if not settings.PUBLIC_KEY_PATH:
+        raise RuntimeError("PUBLIC_KEY_PATH introuvable pour clés asymétriques")
+    paths = [settings.PUBLIC_KEY_PATH]
+    if settings.JWT_EXTRA_PUBLIC_KEY_PATHS:
+        paths += [p.strip() for p in settings.JWT_EXTRA_PUBLIC_KEY_PATHS.split(",") if p.strip()]
+    keys: dict[str, object] = {}
+    for path in paths:
+        entry = _load_pem(path, private=False)
+        keys.setdefault(entry.kid, entry.key)
+    return keys
+
+
+def _verifying_key(token: str):
+    if ALGORITHM == "HS256":
+        return _hs256_secret()
+    keys = _verifying_keys()
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is None:
+        # Tokens émis avant l'ajout du kid: clé publique courante
+        return _load_pem(settings.PUBLIC_KEY_PATH, private=False).key
+    key = keys.get(kid)
+    if key is None:
+        raise InvalidTokenError(f"Clé de signature inconnue (kid={kid})")
+    return key
+
+
+def _encode(payload: dict) -> str:
+    if ALGORITHM == "HS256":
+        return jwt.encode(payload, _hs256_secret(), algorithm=ALGORITHM)
+    entry = _signing_key()
+    return jwt.encode(payload, entry.key, algorithm=ALGORITHM, headers={"kid": entry.kid})
+
+
+def create_access_token(subject: str, roles: Optional[list[str]] = None, email: Optional[str] = None) -> str:
+    now = datetime.now(timezone.utc)
+    exp = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    payload = {"sub": subject, "roles": roles or [], "iat": int(now.timestamp()), "exp": int(exp.timestamp()), "type": "access"}
+    if email:
+        # Permet au frontend (vérification locale) d'afficher l'en-tête sans appeler /me
+        payload["email"] = email
+    return _encode(payload)
+
+def create_refresh_token(subject: str) -> str:
+    now = datetime.now(timezone.utc)
+    exp = now + timedelta(days=7)  # Refresh token valide 7 jours
+    payload = {"sub": subject, "iat": int(now.timestamp()), "exp": int(exp.timestamp()), "type": "refresh"}
+    # jti: deux logins dans la même seconde ne doivent pas produire le même token (token_hash unique)
+    payload["jti"] = secrets.token_urlsafe(16)
+    return _encode(payload)
+
+def create_email_verification_token(email: str) -> str:
+    """Crée un token pour la vérification d'email (valide 24h)"""
+    now = datetime.now(timezone.utc)
+    exp = now + timedelta(hours=24)
+    payload = {"email": email, "iat": int(now.timestamp()), "exp": int(exp.timestamp()), "type": "email_verification"}
+    return _encode(payload)
+
+def create_password_reset_token(email: str) -> str:
+    """Crée un token pour le reset de mot de passe (valide 1h)"""
+    now = datetime.now(timezone.utc)
+    exp = now + timedelta(hours=1)
+    payload = {"email": email, "iat": int(now.timestamp()), "exp": int(exp.timestamp()), "type": "password_reset"}
+    return _encode(payload)
+
+def decode_token(token: str) -> dict:
+    return jwt.decode(token, _verifying_key(token), algorithms=[ALGORITHM])
@@ -6,6 +6,16 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     # Base de données
     DATABASE_URL: str = Field(default="sqlite:///./db.sqlite3", env="DATABASE_URL")
+    DB_POOL_SIZE: int = Field(default=5, env="DB_POOL_SIZE")  # connexions permanentes par worker
+    DB_MAX_OVERFLOW: int = Field(default=10, env="DB_MAX_OVERFLOW")  # connexions temporaires en plus
+    DB_POOL_TIMEOUT: float = Field(default=30.0, env="DB_POOL_TIMEOUT")  # attente max d'une connexion (s)
+    DB_POOL_RECYCLE: int = Field(default=1800, env="DB_POOL_RECYCLE")  # recycle les connexions plus vieilles (s), -1 = jamais
+    DB_POOL_PRE_PING: bool = Field(default=True, env="DB_POOL_PRE_PING")  # détecte les connexions mortes
+    DB_STATEMENT_TIMEOUT_MS: int = Field(default=0, env="DB_STATEMENT_TIMEOUT_MS")  # Postgres uniquement, 0 = désactivé
+    SQLITE_PROFILE: str = Field(default="default", env="SQLITE_PROFILE")  # default | production (WAL + écritures sérialisées)
+    SQLITE_BUSY_TIMEOUT_MS: int = Field(default=5000, env="SQLITE_BUSY_TIMEOUT_MS")
+    SQLITE_MMAP_SIZE_MB: int = Field(default=256, env="SQLITE_MMAP_SIZE_MB")
+    SQLITE_CACHE_SIZE_MB: int = Field(default=64, env="SQLITE_CACHE_SIZE_MB")
 
     # App web
     AUTH_SERVICE_URL: str = Field(default=f"http://127.0.0.1:8000", env="AUTH_SERVICE_URL")
@@ -13,12 +23,46 @@ class Settings(BaseSettings):
     COOKIE_NAME: str = Field(default="session", env="COOKIE_NAME")
     COOKIE_SECURE: bool = Field(default=False, env="COOKIE_SECURE")
     COOKIE_SAMESITE: str = Field(default="lax", env="COOKIE_SAMESITE")
+    WEB_SESSION_CACHE_TTL: int = Field(default=60, env="WEB_SESSION_CACHE_TTL")  # secondes, 0 = désactivé
+    WEB_SESSION_CACHE_MAX_ENTRIES: int = Field(default=10000, env="WEB_SESSION_CACHE_MAX_ENTRIES")
+    WEB_ORG_CACHE_TTL: int = Field(default=30, env="WEB_ORG_CACHE_TTL")  # secondes, 0 = désactivé
+    WEB_ORG_CACHE_MAX_ENTRIES: int = Field(default=10000, env="WEB_ORG_CACHE_MAX_ENTRIES")
+    WEB_LOCAL_JWT_VERIFY: bool = Field(default=False, env="WEB_LOCAL_JWT_VERIFY")  # vérifie le JWT sans appeler /me
+    WEB_STREAMING_RENDER: bool = Field(default=False, env="WEB_STREAMING_RENDER")  # /projects et /dashboard rendus en flux
+    WEB_TEMPLATE_CACHE_DIR: str = Field(default="", env="WEB_TEMPLATE_CACHE_DIR")  # cache de bytecode Jinja, vide = désactivé
+    WEB_UPSTREAM_TIMEOUT: float = Field(default=5.0, env="WEB_UPSTREAM_TIMEOUT")  # s, appels web -> auth
+    WEB_UPSTREAM_CONNECT_TIMEOUT: float = Field(default=2.0, env="WEB_UPSTREAM_CONNECT_TIMEOUT")
+    WEB_UPSTREAM_MAX_CONNECTIONS: int = Field(default=100, env="WEB_UPSTREAM_MAX_CONNECTIONS")
+    WEB_UPSTREAM_MAX_KEEPALIVE: int = Field(default=20, env="WEB_UPSTREAM_MAX_KEEPALIVE")
+    WEB_UPSTREAM_KEEPALIVE_EXPIRY: float = Field(default=30.0, env="WEB_UPSTREAM_KEEPALIVE_EXPIRY")  # s
+    WEB_UPSTREAM_HTTP2: bool = Field(default=False, env="WEB_UPSTREAM_HTTP2")  # nécessite httpx[http2]
+    WEB_UPSTREAM_UDS: str = Field(default="", env="WEB_UPSTREAM_UDS")  # socket Unix du service auth (même hôte)
+    WEB_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5, env="WEB_CIRCUIT_FAILURE_THRESHOLD")  # échecs consécutifs, 0 = désactivé
+    WEB_CIRCUIT_SLOW_CALL_MS: float = Field(default=2000.0, env="WEB_CIRCUIT_SLOW_CALL_MS")  # au-delà: compté comme échec
+    WEB_CIRCUIT_RESET_TIMEOUT: float = Field(default=10.0, env="WEB_CIRCUIT_RESET_TIMEOUT")  # s avant l'appel de test
+    WEB_CIRCUIT_SLOW_CALL_EXEMPT: str = Field(
+        default="POST /auth/login,POST /auth/register,POST /auth/reset-password,POST /auth/change-password",
+        env="WEB_CIRCUIT_SLOW_CALL_EXEMPT",
+    )  # routes hachant un mot de passe: lenteur non comptée
+    WEB_UPSTREAM_HEDGE_DELAY_MS: float = Field(default=0.0, env="WEB_UPSTREAM_HEDGE_DELAY_MS")  # 0 = pas de requête doublée
+    WEB_UPSTREAM_HEDGE_PATHS: str = Field(default="/me,/auth/organizations,/auth/context", env="WEB_UPSTREAM_HEDGE_PATHS")  # GET idempotents
 
     # JWT/Auth
+    JWT_ALGORITHM: str = Field(default="HS256", env="JWT_ALGORITHM")  # HS256, RS256 ou ES256
     SECRET_KEY: Optional[SecretStr] = Field(default=None, env="SECRET_KEY")
     PRIVATE_KEY_PATH: Optional[str] = Field(default=None, env="PRIVATE_KEY_PATH")
     PUBLIC_KEY_PATH: Optional[str] = Field(default=None, env="PUBLIC_KEY_PATH")
+    JWT_EXTRA_PUBLIC_KEY_PATHS: Optional[str] = Field(default=None, env="JWT_EXTRA_PUBLIC_KEY_PATHS")  # clés encore acceptées (rotation), séparées par des virgules
+    JWT_KEY_CHECK_INTERVAL: float = Field(default=5.0, env="JWT_KEY_CHECK_INTERVAL")  # secondes entre deux vérifications du mtime
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    PASSWORD_HASH_WORKERS: int = Field(default=2, env="PASSWORD_HASH_WORKERS")  # threads argon2
+    PASSWORD_HASH_MAX_PENDING: int = Field(default=32, env="PASSWORD_HASH_MAX_PENDING")  # au-delà: 429
+    ROLE_CACHE_CHECK_INTERVAL: float = Field(default=30.0, env="ROLE_CACHE_CHECK_INTERVAL")  # s entre deux vérifications de version
+    LOGIN_MAX_FAILED_ATTEMPTS: int = Field(default=5, env="LOGIN_MAX_FAILED_ATTEMPTS")
+    LOGIN_LOCKOUT_MINUTES: int = Field(default=30, env="LOGIN_LOCKOUT_MINUTES")  # durée du verrou et fenêtre de comptage
+    REFRESH_TOKEN_PURGE_INTERVAL: float = Field(default=0.0, env="REFRESH_TOKEN_PURGE_INTERVAL")  # s, 0 = purge via le CLI seulement
+    REFRESH_TOKEN_PURGE_BATCH_SIZE: int = Field(default=1000, env="REFRESH_TOKEN_PURGE_BATCH_SIZE")
+    LAST_LOGIN_FLUSH_INTERVAL: float = Field(default=0.0, env="LAST_LOGIN_FLUSH_INTERVAL")  # s, 0 = écrit pendant le login
 
     # Email & Vérification
     SKIP_EMAIL_VERIFICATION: bool = Field(default=False, env="SKIP_EMAIL_VERIFICATION")
@@ -49,6 +93,17 @@ class Settings(BaseSettings):
     # CORS & Redis
     CORS_ORIGINS: str = Field(default="http://localhost:8001,http://127.0.0.1:8001", env="CORS_ORIGINS")
     REDIS_URL: str = Field(default="redis://localhost:6379", env="REDIS_URL")
+
+    # Rate limiting des endpoints d'auth ("N/secondes", vide = pas de limite)
+    RATE_LIMIT_ENABLED: bool = Field(default=True, env="RATE_LIMIT_ENABLED")
+    RATE_LIMIT_REGISTER_IP: str = Field(default="5/300", env="RATE_LIMIT_REGISTER_IP")
+    RATE_LIMIT_LOGIN_IP: str = Field(default="30/60", env="RATE_LIMIT_LOGIN_IP")
+    RATE_LIMIT_LOGIN_ACCOUNT: str = Field(default="10/60", env="RATE_LIMIT_LOGIN_ACCOUNT")
+    RATE_LIMIT_REFRESH_IP: str = Field(default="60/60", env="RATE_LIMIT_REFRESH_IP")
+    RATE_LIMIT_RESET_IP: str = Field(default="5/300", env="RATE_LIMIT_RESET_IP")
+    RATE_LIMIT_TRUSTED_PROXIES: str = Field(default="127.0.0.1,::1", env="RATE_LIMIT_TRUSTED_PROXIES")  # IP/CIDR dont X-Forwarded-For est lu (app web)
+    RATE_LIMIT_LOCAL_SHARDS: int = Field(default=16, env="RATE_LIMIT_LOCAL_SHARDS")  # fallback sans Redis
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = Field(default=100000, env="RATE_LIMIT_LOCAL_MAX_KEYS")  # éviction LRU au-delà
     
     # Environnement
     APP_ENV: str = Field(default="development", env="APP_ENV")
@@ -9,6 +9,9 @@ if not os.environ.get("SECRET_KEY"):
 # Utilise SQLite en mémoire pour les tests (plus rapide, pas de fichiers)
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
+# Les tests enchaînent inscriptions et logins depuis la même IP: pas de rate limiting
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
 # Maintenant on peut importer les modules qui utilisent SECRET_KEY
 import pytest
 from projet.auth.database import Base, engine
@@ -26,3 +29,34 @@ def db_session():
     finally:
         db.close()
         Base.metadata.drop_all(bind=engine)
+
+
+class QueryCounter:
+    """Requêtes SQL émises sur l'engine pendant le bloc `with`."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements.clear()
+        from sqlalchemy import event
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def query_counter():
+    """`with query_counter as q: ...` puis `q.count` / `q.statements`."""
+    return QueryCounter(engine)
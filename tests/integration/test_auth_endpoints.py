@@ -161,3 +161,277 @@ def test_projects_are_isolated_by_organization_header(db_session):
         team_ids = {p["id"] for p in list_team.json()}
         assert p2_id in team_ids
         assert p1_id not in team_ids
+
+
+def test_page_context_bundles_user_organizations_and_projects(db_session):
+    with TestClient(app) as client:
+        r = client.post("/auth/register", json={
+            "email": "context@test.com",
+            "password": "Test123!",
+            "first_name": None,
+            "last_name": None,
+        })
+        assert r.status_code == 201
+
+        login = client.post("/auth/login", data={"username": "context@test.com", "password": "Test123!"})
+        token = login.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        team_org_id = client.post("/auth/organizations", json={"name": "Equipe C"}, headers=headers).json()["id"]
+        project = client.post(
+            "/auth/projects",
+            json={},
+            headers={**headers, "organization-id": team_org_id},
+        ).json()
+
+        ctx = client.get("/auth/context", headers={**headers, "organization-id": team_org_id})
+        assert ctx.status_code == 200
+        body = ctx.json()
+        assert body["user"]["email"] == "context@test.com"
+        assert "user" in body["user"]["roles"]
+        assert {o["org_type"] for o in body["organizations"]} == {"personal", "team"}
+        assert body["active_organization"]["id"] == team_org_id
+        assert [p["id"] for p in body["projects"]] == [project["id"]]
+
+        # Organisation inconnue => repli sur la première organisation
+        fallback = client.get("/auth/context", headers={**headers, "organization-id": "unknown"})
+        assert fallback.json()["active_organization"]["id"] == body["organizations"][0]["id"]
+
+        detail = client.get(
+            "/auth/context",
+            params={"project_id": project["id"]},
+            headers={**headers, "organization-id": team_org_id},
+        )
+        assert detail.json()["project"]["id"] == project["id"]
+        assert detail.json()["projects"] == []
+
+        assert client.get("/auth/context").status_code == 401
+
+
+def test_current_user_is_bound_to_request_session(db_session):
+    with TestClient(app) as client:
+        client.post("/auth/register", json={
+            "email": "session@test.com",
+            "password": "Test123!",
+            "first_name": None,
+            "last_name": None,
+        })
+        tokens = client.post("/auth/login", data={"username": "session@test.com", "password": "Test123!"}).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        # La mise à jour porte sur l'objet chargé par la dépendance: elle doit être persistée
+        r = client.put("/auth/me", json={"first_name": "Ada"}, headers=headers)
+        assert r.status_code == 200
+        assert client.get("/auth/me", headers=headers).json()["first_name"] == "Ada"
+
+        # Un refresh token n'est pas un token d'accès
+        refresh_headers = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+        assert client.get("/auth/me", headers=refresh_headers).status_code == 401
+
+
+def test_register_is_a_single_transaction(db_session):
+    from sqlalchemy import event
+    from projet.auth import models
+    from projet.auth.database import engine
+
+    commits = []
+    listener = lambda conn: commits.append(1)  # noqa: E731
+    event.listen(engine, "commit", listener)
+    try:
+        with TestClient(app) as client:
+            r = client.post("/auth/register", json={
+                "email": "atomic@test.com",
+                "password": "Test123!",
+                "first_name": None,
+                "last_name": None,
+            })
+            assert r.status_code == 201
+    finally:
+        event.remove(engine, "commit", listener)
+
+    assert len(commits) == 1
+    user = db_session.query(models.User).filter_by(email="atomic@test.com").one()
+    assert [role.name for role in user.roles] == ["user"]
+    assert [org.org_type for org in user.organizations] == ["personal"]
+
+
+def test_login_skips_personal_organization_lookup(db_session):
+    from sqlalchemy import event
+    from projet.auth import models
+    from projet.auth.database import engine
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    with TestClient(app) as client:
+        client.post("/auth/register", json={
+            "email": "fastpath@test.com",
+            "password": "Test123!",
+            "first_name": None,
+            "last_name": None,
+        })
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            r = client.post("/auth/login", data={"username": "fastpath@test.com", "password": "Test123!"})
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert r.status_code == 200
+    assert not any("organizations" in s or "organization_users" in s for s in statements)
+
+    # Compte antérieur à la migration 0005: l'org perso existante est retrouvée et mémorisée
+    user = db_session.query(models.User).filter_by(email="fastpath@test.com").one()
+    personal_id = user.personal_organization_id
+    user.personal_organization_id = None
+    db_session.commit()
+    with TestClient(app) as client:
+        r = client.post("/auth/login", data={"username": "fastpath@test.com", "password": "Test123!"})
+        assert r.status_code == 200
+    db_session.expire_all()
+    assert user.personal_organization_id == personal_id
+    assert db_session.query(models.Organization).filter_by(org_type="personal").count() == 1
+
+
+def test_login_is_a_single_transaction(db_session):
+    from sqlalchemy import event
+    from projet.auth.database import engine
+
+    commits = []
+    listener = lambda conn: commits.append(1)  # noqa: E731
+    with TestClient(app) as client:
+        client.post("/auth/register", json={
+            "email": "onetx@test.com",
+            "password": "Test123!",
+            "first_name": None,
+            "last_name": None,
+        })
+        event.listen(engine, "commit", listener)
+        try:
+            r = client.post("/auth/login", data={"username": "onetx@test.com", "password": "Test123!"})
+        finally:
+            event.remove(engine, "commit", listener)
+        assert r.status_code == 200
+    assert len(commits) == 1
+
+
+def test_failed_logins_only_write_user_row_on_lock(db_session):
+    from sqlalchemy import event
+    from projet.auth.database import engine
+
+    updates = []
+
+    def listener(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE users"):
+            updates.append(statement)
+
+    with TestClient(app) as client:
+        client.post("/auth/register", json={
+            "email": "stuffing@test.com",
+            "password": "Test123!",
+            "first_name": None,
+            "last_name": None,
+        })
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            for _ in range(4):
+                r = client.post("/auth/login", data={"username": "stuffing@test.com", "password": "wrong"})
+                assert r.status_code == 401
+            assert updates == []
+            r = client.post("/auth/login", data={"username": "stuffing@test.com", "password": "wrong"})
+            assert r.status_code == 401
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(updates) == 1
+
+        r = client.post("/auth/login", data={"username": "stuffing@test.com", "password": "Test123!"})
+        assert r.status_code == 423
+
+
+def test_login_is_rate_limited_per_ip(db_session, monkeypatch):
+    from projet.auth.ratelimit import Limit, LocalTokenBuckets, rate_limiter
+
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    monkeypatch.setattr(rate_limiter, "rules", {"login": (Limit(2, 60), None)})
+    monkeypatch.setattr(rate_limiter, "_local", LocalTokenBuckets())
+    with TestClient(app) as client:
+        for _ in range(2):
+            r = client.post("/auth/login", data={"username": "nobody@test.com", "password": "x"})
+            assert r.status_code == 401
+        r = client.post("/auth/login", data={"username": "nobody@test.com", "password": "x"})
+        assert r.status_code == 429
+        assert "retry-after" in {k.lower() for k in r.headers}
+
+
+def test_refresh_rotation_and_replay_revokes_family(db_session):
+    from projet.auth import models
+
+    with TestClient(app) as client:
+        client.post("/auth/register", json={
+            "email": "family@test.com",
+            "password": "Test123!",
+            "first_name": None,
+            "last_name": None,
+        })
+        first = client.post("/auth/login", data={"username": "family@test.com", "password": "Test123!"}).json()
+        other_session = client.post("/auth/login", data={"username": "family@test.com", "password": "Test123!"}).json()
+
+        r = client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]})
+        assert r.status_code == 200
+        second = r.json()
+        assert second["refresh_token"] != first["refresh_token"]
+
+        # Rejeu de l'ancien token: refusé, et toute la famille est révoquée
+        assert client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]}).status_code == 401
+        assert client.post("/auth/refresh", json={"refresh_token": second["refresh_token"]}).status_code == 401
+
+        # Les autres sessions (autre login = autre famille) ne sont pas touchées
+        assert client.post("/auth/refresh", json={"refresh_token": other_session["refresh_token"]}).status_code == 200
+
+    families = {t.family_id for t in db_session.query(models.RefreshToken)}
+    assert len(families) == 2
+
+
+def test_replay_after_purge_still_revokes_family(db_session):
+    from datetime import datetime, timedelta
+
+    from projet.auth.token_maintenance import purge_refresh_tokens
+
+    with TestClient(app) as client:
+        client.post("/auth/register", json={
+            "email": "purged-family@test.com",
+            "password": "Test123!",
+            "first_name": None,
+            "last_name": None,
+        })
+        first = client.post("/auth/login", data={"username": "purged-family@test.com", "password": "Test123!"}).json()
+        second = client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]}).json()
+
+        # Purge un jour plus tard: le token tourné n'a pas expiré, sa ligne reste
+        purge_refresh_tokens(now=datetime.utcnow() + timedelta(hours=25))
+
+        assert client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]}).status_code == 401
+        assert client.post("/auth/refresh", json={"refresh_token": second["refresh_token"]}).status_code == 401
+
+
+def test_default_project_names_use_org_counter_and_skip_taken_names(db_session):
+    with TestClient(app) as client:
+        client.post("/auth/register", json={
+            "email": "names@test.com",
+            "password": "Test123!",
+            "first_name": None,
+            "last_name": None,
+        })
+        token = client.post("/auth/login", data={"username": "names@test.com", "password": "Test123!"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def create(name=None):
+            return client.post("/auth/projects", json={"name": name}, headers=headers)
+
+        assert create().json()["name"] == "projet"
+        assert create("projet_3").status_code == 201  # nom saisi à la main
+        assert create().json()["name"] == "projet_2"
+        assert create().json()["name"] == "projet_4"  # projet_3 déjà pris: le compteur avance
+
+        # Unicité (organisation, nom)
+        assert create("projet").status_code == 409
+        other = create("autre").json()
+        r = client.patch(f"/auth/projects/{other['id']}", json={"name": "projet_2"}, headers=headers)
+        assert r.status_code == 409
@@ -0,0 +1,57 @@
+"""Budgets de requêtes SQL par endpoint: une régression N+1 fait échouer le test.
+
+Un chargement paresseux ajouté dans une route (ex. `user.roles` sans option
+déclarée dans projet.auth.loaders) dépasse le budget et apparaît dans le
+message d'échec avec la liste des requêtes.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from projet.auth.app import app
+
+
+@pytest.fixture
+def signed_in(db_session):
+    with TestClient(app) as client:
+        client.post("/auth/register", json={"email": "budget@test.com", "password": "Test123!"})
+        tokens = client.post("/auth/login", data={"username": "budget@test.com", "password": "Test123!"}).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        # Assez de données pour qu'un N+1 se voie
+        for i in range(5):
+            client.post("/auth/projects", json={"name": f"p{i}"}, headers=headers)
+        client.post("/auth/organizations", json={"name": "Team"}, headers=headers)
+        yield client, headers, tokens
+
+
+BUDGETS = [
+    ("get", "/me", {}, 2),
+    ("get", "/auth/me", {}, 1),
+    ("get", "/auth/projects", {}, 2),
+    ("get", "/auth/organizations", {}, 2),
+    ("get", "/auth/context", {}, 4),
+    # compteur de l'org (UPDATE ... RETURNING) + INSERT sous SAVEPOINT/RELEASE, indépendant du nombre de projets
+    ("post", "/auth/projects", {"json": {"name": None}}, 8),
+    ("put", "/auth/me", {"json": {"first_name": "Ada"}}, 4),
+]
+
+
+@pytest.mark.parametrize("method,path,kwargs,budget", BUDGETS, ids=[f"{m.upper()} {p}" for m, p, _, _ in BUDGETS])
+def test_endpoint_query_budget(signed_in, query_counter, method, path, kwargs, budget):
+    client, headers, _ = signed_in
+    with query_counter as q:
+        r = getattr(client, method)(path, headers=headers, **kwargs)
+    assert r.status_code < 400
+    assert q.count <= budget, f"{q.count} requêtes (budget {budget}):\n" + "\n".join(q.statements)
+
+
+def test_login_and_refresh_query_budget(signed_in, query_counter):
+    client, _, tokens = signed_in
+    with query_counter as q:
+        r = client.post("/auth/login", data={"username": "budget@test.com", "password": "Test123!"})
+    assert r.status_code == 200
+    assert q.count <= 4, "\n".join(q.statements)
+
+    with query_counter as q:
+        r = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert r.status_code == 200
+    assert q.count <= 4, "\n".join(q.statements)
@@ -15,3 +15,215 @@ def test_dashboard_requires_auth(monkeypatch):
         r = client.get("/dashboard", follow_redirects=False)
         # redirection vers /login si non authentifié
         assert r.status_code in (302, 303)
+
+
+def test_dashboard_uses_single_context_call():
+    from unittest.mock import AsyncMock, Mock, patch
+
+    context = Mock()
+    context.status_code = 200
+    context.json.return_value = {
+        "user": {"id": 1, "email": "ctx@test.com", "is_verified": True, "roles": ["user"]},
+        "organizations": [{"id": "o1", "name": "Espace perso", "org_type": "personal", "owner_user_id": 1}],
+        "active_organization": {"id": "o1", "name": "Espace perso", "org_type": "personal", "owner_user_id": 1},
+        "projects": [{"id": "p1", "name": "projet"}],
+        "project": None,
+    }
+    with patch("projet.app.web.client.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = context
+        with TestClient(app) as client:
+            client.cookies.set("session", "fake-token")
+            r = client.get("/dashboard")
+        assert r.status_code == 200
+        assert "ctx@test.com" in r.text
+        assert mock_get.await_count == 1
+        assert "/auth/context" in mock_get.await_args.args[0]
+        assert "Server-Timing" in r.headers
+
+
+def test_organizations_page_served_from_cache_until_selection():
+    import time
+    from unittest.mock import AsyncMock, Mock, patch
+
+    import jwt
+
+    from projet.app import web
+
+    web.session_cache.clear()
+    web.organization_cache.clear()
+    token = jwt.encode({"sub": "7", "exp": int(time.time()) + 600}, "x" * 32, algorithm="HS256")
+    orgs = [
+        {"id": "o1", "name": "Espace perso", "org_type": "personal", "owner_user_id": 7},
+        {"id": "o2", "name": "Équipe", "org_type": "team", "owner_user_id": 7},
+    ]
+    context = Mock()
+    context.status_code = 200
+    context.json.return_value = {
+        "user": {"id": 7, "email": "orgs@test.com", "is_verified": True, "roles": ["user"]},
+        "organizations": orgs,
+        "active_organization": orgs[0],
+        "projects": [],
+        "project": None,
+    }
+    selected = Mock()
+    selected.status_code = 200
+    with patch("projet.app.web.client.get", new_callable=AsyncMock) as mock_get, \
+            patch("projet.app.web.client.post", new_callable=AsyncMock) as mock_post:
+        mock_get.return_value = context
+        mock_post.return_value = selected
+        with TestClient(app) as client:
+            client.cookies.set("session", token)
+            assert client.get("/organizations").status_code == 200
+            r = client.get("/organizations")
+            assert r.status_code == 200 and "Équipe" in r.text
+            assert mock_get.await_count == 1
+
+            client.post(
+                "/organizations/select",
+                data={"organization_id": "o2", "next_path": "/organizations"},
+                follow_redirects=False,
+            )
+            client.cookies.set("active_organization_id", "o2")
+            assert client.get("/organizations").status_code == 200
+            assert mock_get.await_count == 2
+    web.session_cache.clear()
+    web.organization_cache.clear()
+
+
+def _context_response(projects):
+    from unittest.mock import Mock
+
+    org = {"id": "o1", "name": "Espace perso", "org_type": "personal", "owner_user_id": 7}
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        "user": {"id": 7, "email": "stream@test.com", "is_verified": True, "roles": ["user"]},
+        "organizations": [org],
+        "active_organization": org,
+        "projects": projects,
+        "project": None,
+    }
+    return response
+
+
+def test_projects_page_streams_when_session_is_cached(monkeypatch):
+    import time
+    from unittest.mock import AsyncMock, patch
+
+    import jwt
+
+    from projet.app import web
+
+    web.session_cache.clear()
+    web.organization_cache.clear()
+    monkeypatch.setattr(web.settings, "WEB_STREAMING_RENDER", True)
+    token = jwt.encode({"sub": "7", "exp": int(time.time()) + 600}, "x" * 32, algorithm="HS256")
+    with patch("projet.app.web.client.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = _context_response([{"id": "p1", "name": "projet-flux"}])
+        with TestClient(app) as client:
+            client.cookies.set("session", token)
+            # Premier passage: caches vides, rendu classique
+            r = client.get("/projects")
+            assert "content-length" in r.headers
+            r = client.get("/projects")
+            assert r.status_code == 200
+            assert "content-length" not in r.headers
+            assert "stream@test.com" in r.text and "projet-flux" in r.text
+            assert "stream-slot" not in r.text
+            assert mock_get.await_count == 2
+
+            dashboard = client.get("/dashboard")
+            assert dashboard.status_code == 200 and "content-length" not in dashboard.headers
+    web.session_cache.clear()
+    web.organization_cache.clear()
+
+
+def test_streamed_projects_page_survives_invalid_context_json(monkeypatch):
+    import time
+    from unittest.mock import AsyncMock, patch
+
+    import jwt
+
+    from projet.app import web
+
+    web.session_cache.clear()
+    web.organization_cache.clear()
+    monkeypatch.setattr(web.settings, "WEB_STREAMING_RENDER", True)
+    token = jwt.encode({"sub": "7", "exp": int(time.time()) + 600}, "x" * 32, algorithm="HS256")
+    broken = _context_response([])
+    broken.json.side_effect = ValueError("pas du JSON")
+    with patch("projet.app.web.client.get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = [_context_response([]), broken]
+        with TestClient(app) as client:
+            client.cookies.set("session", token)
+            client.get("/projects")
+            r = client.get("/projects")
+    assert r.status_code == 200
+    assert "content-length" not in r.headers
+    assert "Impossible de charger les projets" in r.text
+    assert r.text.rstrip().endswith("</html>")
+    web.session_cache.clear()
+    web.organization_cache.clear()
+
+
+def test_projects_fragment_returns_only_the_list():
+    from unittest.mock import AsyncMock, patch
+
+    with patch("projet.app.web.client.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = _context_response([{"id": "p1", "name": "projet-fragment"}])
+        with TestClient(app) as client:
+            assert client.get("/projects/fragment").status_code == 401
+            client.cookies.set("session", "fake-token")
+            r = client.get("/projects/fragment")
+    assert r.status_code == 200
+    assert "projet-fragment" in r.text
+    assert "<html" not in r.text
+
+
+def test_login_forwards_browser_ip_to_auth_service():
+    from unittest.mock import AsyncMock, Mock, patch
+
+    refused = Mock()
+    refused.status_code = 401
+    with patch("projet.app.web.client.post", new_callable=AsyncMock) as mock_post:
+        mock_post.return_value = refused
+        with TestClient(app) as client:
+            client.post("/login", data={"email": "ip@test.com", "password": "x"})
+    assert mock_post.await_args.kwargs["headers"]["X-Forwarded-For"] == "testclient"
+
+
+def test_context_5xx_keeps_session_and_shows_error():
+    from unittest.mock import AsyncMock, Mock, patch
+
+    failing = Mock()
+    failing.status_code = 503
+    me = Mock()
+    me.status_code = 200
+    me.json.return_value = {"id": 9, "email": "degraded@test.com", "is_verified": True, "roles": ["user"]}
+
+    async def fake_get(url, headers=None):
+        return failing if "/auth/context" in url else me
+
+    with patch("projet.app.web.client.get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = fake_get
+        with TestClient(app) as client:
+            client.cookies.set("session", "fake-token")
+            r = client.get("/projects", follow_redirects=False)
+    assert r.status_code == 200
+    assert "degraded@test.com" in r.text
+    assert "Impossible de récupérer la liste des projets" in r.text
+    assert "set-cookie" not in r.headers
+
+
+def test_context_401_clears_session():
+    from unittest.mock import AsyncMock, Mock, patch
+
+    refused = Mock()
+    refused.status_code = 401
+    with patch("projet.app.web.client.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = refused
+        with TestClient(app) as client:
+            client.cookies.set("session", "fake-token")
+            r = client.get("/projects", follow_redirects=False)
+    assert r.status_code == 303
+    assert 'session=""' in r.headers.get("set-cookie", "")
@@ -0,0 +1,81 @@
+import pytest
+
+from projet.app.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    route_key,
+)
+
+
+def test_route_key_replaces_ids():
+    assert route_key("get", "http://auth/auth/projects/42?x=1") == "GET /auth/projects/{id}"
+    assert (
+        route_key("PATCH", "http://auth/auth/projects/3f2b8c1e-0d4a-4b6e-9a51-2c7d8e9f0a1b")
+        == "PATCH /auth/projects/{id}"
+    )
+    assert route_key("GET", "http://auth/me") == "GET /me"
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, slow_call_ms=0, reset_timeout=60)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record(False)
+    breaker.before_call()
+    breaker.record(True)
+    assert breaker.state == CLOSED and breaker.failures == 0
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record(False)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.rejected == 1
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_ms=0, reset_timeout=0)
+    breaker.before_call()
+    breaker.record(False)
+    assert breaker.before_call() is True
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record(False, probe=True)
+    assert breaker.state == OPEN
+
+    assert breaker.before_call() is True
+    breaker.record(True, probe=True)
+    assert breaker.state == CLOSED
+
+
+def test_cancelled_probe_frees_the_slot():
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_ms=0, reset_timeout=0)
+    breaker.before_call()
+    breaker.record(False)
+    probe = breaker.before_call()
+    breaker.release(probe)
+    assert breaker.before_call() is True
+
+
+def test_disabled_registry_and_stats():
+    assert CircuitBreakers(failure_threshold=0, slow_call_ms=0, reset_timeout=1).get("GET /me") is None
+    breakers = CircuitBreakers(failure_threshold=1, slow_call_ms=100, reset_timeout=60)
+    breaker = breakers.get("GET /me")
+    assert breakers.get("GET /me") is breaker
+    assert breaker.is_slow(150) and not breaker.is_slow(50)
+    breakers.record("GET /me", breaker, success=False, probe=False)
+    assert breakers.stats()["open"] == ["GET /me"]
+    assert breakers.stats()["opened"] == 1
+
+
+def test_exempt_routes_ignore_slow_calls():
+    breakers = CircuitBreakers(
+        failure_threshold=1, slow_call_ms=100, reset_timeout=60, slow_call_exempt=("POST /auth/login",)
+    )
+    assert not breakers.get("POST /auth/login").is_slow(5000)
+    assert breakers.get("GET /me").is_slow(5000)
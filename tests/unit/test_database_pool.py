@@ -0,0 +1,27 @@
+from sqlalchemy import create_engine, text
+
+from projet.auth import database
+
+
+def test_instrumented_pool_records_checkout_wait(monkeypatch, tmp_path):
+    metrics = database.PoolMetrics()
+    monkeypatch.setattr(database, "pool_metrics", metrics)
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=database.InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+    )
+    try:
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        assert metrics.checkouts == 3
+        assert sum(metrics.histogram().values()) == 3
+    finally:
+        engine.dispose()
+
+
+def test_pool_stats_reports_pool_class():
+    stats = database.pool_stats()
+    assert stats["pool"] == type(database.engine.pool).__name__
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from projet.auth.hashing import PasswordHashPool
+
+
+def test_run_executes_off_the_event_loop_thread():
+    pool = PasswordHashPool(workers=1, max_pending=4)
+    try:
+        loop_thread = threading.get_ident()
+        worker_thread = asyncio.run(pool.run(threading.get_ident))
+        assert worker_thread != loop_thread
+        stats = pool.stats()
+        assert stats["completed"] == 1 and stats["pending"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_saturated_pool_returns_429():
+    pool = PasswordHashPool(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as exc:
+            await pool.run(lambda: None)
+        release.set()
+        await first
+        return exc.value
+
+    try:
+        exc = asyncio.run(scenario())
+        assert exc.status_code == 429
+        assert pool.stats()["rejected"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_cancelled_caller_keeps_slot_until_hash_finishes():
+    pool = PasswordHashPool(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0.01)
+        # Le calcul tourne toujours dans le pool: la place reste prise
+        assert pool.pending == 1
+        with pytest.raises(HTTPException):
+            await pool.run(lambda: None)
+        release.set()
+        for _ in range(100):
+            if pool.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.pending == 0
+        assert await pool.run(lambda: "ok") == "ok"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
@@ -0,0 +1,194 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from projet.app.circuit_breaker import CircuitBreakers
+from projet.app.http_client import UpstreamClient
+
+
+def _upstream(handler=None, **kwargs):
+    handler = handler or (lambda request: httpx.Response(200, json={"path": request.url.path}))
+    options = dict(timeout=5.0, connect_timeout=1.0, max_connections=2, max_keepalive_connections=1, keepalive_expiry=5.0)
+    options.update(kwargs)
+    return UpstreamClient(transport=httpx.MockTransport(handler), **options)
+
+
+def test_lifecycle_builds_and_closes_client():
+    upstream = _upstream()
+
+    async def run():
+        await upstream.start()
+        first = upstream.client
+        await upstream.start()
+        assert upstream.client is first
+        await upstream.aclose()
+        assert first.is_closed
+        assert upstream._client is None
+
+    asyncio.run(run())
+
+
+def test_requests_are_delegated_and_counted():
+    upstream = _upstream()
+
+    async def run():
+        r = await upstream.get("http://auth/me", headers={"Authorization": "Bearer t"})
+        await upstream.post("http://auth/auth/projects", json={"name": "x"})
+        await upstream.aclose()
+        return r
+
+    r = asyncio.run(run())
+    assert r.json() == {"path": "/me"}
+    stats = upstream.stats()
+    assert stats["requests"] == 2
+    assert stats["in_flight"] == 0 and stats["peak_in_flight"] == 1
+    assert stats["errors"] == 0
+
+
+def test_saturation_and_errors_are_reported():
+    async def slow(request):
+        await asyncio.sleep(0.01)
+        if request.url.path == "/fail":
+            raise httpx.ConnectError("refusé")
+        return httpx.Response(200)
+
+    upstream = _upstream(slow)
+
+    async def run():
+        await asyncio.gather(*(upstream.get("http://auth/ok") for _ in range(3)))
+        with pytest.raises(httpx.ConnectError):
+            await upstream.get("http://auth/fail")
+        await upstream.aclose()
+
+    asyncio.run(run())
+    stats = upstream.stats()
+    assert stats["peak_in_flight"] == 3
+    assert stats["saturated"] == 1
+    assert stats["errors"] == 1
+
+
+def test_tracer_measures_pool_wait_and_connect():
+    upstream = _upstream()
+    trace = upstream._tracer(time.perf_counter() - 0.05)
+
+    async def run():
+        await trace("connection.connect_tcp.started", {})
+        await trace("connection.connect_tcp.complete", {})
+        await trace("http11.send_request_headers.started", {})
+
+    asyncio.run(run())
+    stats = upstream.stats()
+    assert stats["pool_wait"]["count"] == 1 and stats["pool_wait"]["max_ms"] >= 50
+    assert stats["connect"]["count"] == 1
+
+
+def test_http2_requires_h2(monkeypatch):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def no_h2(name, *args, **kwargs):
+        if name == "h2":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_h2)
+    upstream = UpstreamClient(
+        timeout=5.0, connect_timeout=1.0, max_connections=2,
+        max_keepalive_connections=1, keepalive_expiry=5.0, http2=True,
+    )
+    with pytest.raises(RuntimeError, match="httpx\\[http2\\]"):
+        upstream.client
+
+
+def test_open_circuit_fails_fast_as_transport_error():
+    calls = []
+
+    def failing(request):
+        calls.append(request.url.path)
+        return httpx.Response(503)
+
+    upstream = _upstream(failing, breakers=CircuitBreakers(failure_threshold=2, slow_call_ms=0, reset_timeout=60))
+
+    async def run():
+        for _ in range(2):
+            assert (await upstream.get("http://auth/me")).status_code == 503
+        with pytest.raises(httpx.HTTPError):
+            await upstream.get("http://auth/me")
+        # Les autres routes ont leur propre circuit
+        await upstream.get("http://auth/auth/context")
+        await upstream.aclose()
+
+    asyncio.run(run())
+    assert calls == ["/me", "/me", "/auth/context"]
+    assert upstream.stats()["circuits"]["open"] == ["GET /me"]
+
+
+def test_slow_get_is_hedged_and_first_response_wins():
+    attempts = []
+
+    async def handler(request):
+        attempts.append(request.url.path)
+        if len(attempts) == 1:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={"attempt": len(attempts)})
+
+    upstream = _upstream(handler, hedge_delay_ms=20, hedge_paths=("/me",))
+
+    async def run():
+        started = time.perf_counter()
+        r = await upstream.get("http://auth/me")
+        elapsed = time.perf_counter() - started
+        await upstream.aclose()
+        return r, elapsed
+
+    r, elapsed = asyncio.run(run())
+    assert r.json() == {"attempt": 2}
+    assert elapsed < 0.5
+    assert upstream.hedges == 1 and upstream.hedge_wins == 1
+    assert upstream.in_flight == 0
+
+
+def test_posts_and_unlisted_paths_are_not_hedged():
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200)
+
+    upstream = _upstream(handler, hedge_delay_ms=10, hedge_paths=("/me",))
+
+    async def run():
+        await upstream.post("http://auth/me")
+        await upstream.get("http://auth/auth/projects")
+        await upstream.aclose()
+
+    asyncio.run(run())
+    assert upstream.hedges == 0 and upstream.requests == 2
+
+
+def test_cancelled_caller_cancels_primary_before_hedge():
+    cancelled = []
+
+    async def handler(request):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(request.url.path)
+            raise
+        return httpx.Response(200)
+
+    upstream = _upstream(handler, hedge_delay_ms=500, hedge_paths=("/me",))
+
+    async def run():
+        caller = asyncio.ensure_future(upstream.get("http://auth/me"))
+        await asyncio.sleep(0.02)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0.01)
+        assert cancelled == ["/me"]
+        await upstream.aclose()
+
+    asyncio.run(run())
+    assert upstream.in_flight == 0 and upstream.hedges == 0
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from projet.auth import models
+from projet.auth.last_login import LastLoginRecorder
+
+
+def test_recorder_coalesces_and_writes_latest(db_session):
+    users = [models.User(email=f"u{i}@test.com", hashed_password="h") for i in range(3)]
+    db_session.add_all(users)
+    db_session.commit()
+
+    recorder = LastLoginRecorder(interval=1.0)
+    t0 = datetime(2026, 1, 1, 12, 0)
+    recorder.record(users[0].id, t0)
+    recorder.record(users[0].id, t0 + timedelta(minutes=5))
+    recorder.record(users[1].id, t0)
+
+    assert recorder.flush() == 2
+    assert recorder.flush() == 0
+    db_session.expire_all()
+    assert users[0].last_login == t0 + timedelta(minutes=5)
+    assert users[1].last_login == t0
+    assert users[2].last_login is None
+    assert recorder.stats()["flushed"] == 2
+
+
+def test_recorder_disabled_by_default():
+    assert not LastLoginRecorder(interval=0).enabled
+
+
+def test_flush_ignores_deleted_users(db_session):
+    users = [models.User(email=f"gone{i}@test.com", hashed_password="h") for i in range(2)]
+    db_session.add_all(users)
+    db_session.commit()
+    kept_id, deleted_id = users[0].id, users[1].id
+
+    recorder = LastLoginRecorder(interval=1.0)
+    when = datetime(2026, 1, 1, 12, 0)
+    recorder.record(kept_id, when)
+    recorder.record(deleted_id, when)
+    db_session.delete(users[1])
+    db_session.commit()
+
+    assert recorder.flush() == 2
+    assert recorder.stats()["pending"] == 0
+    db_session.expire_all()
+    assert db_session.get(models.User, kept_id).last_login == when
+
+    # Les flushs suivants ne restent pas bloqués
+    recorder.record(kept_id, when + timedelta(minutes=1))
+    assert recorder.flush() == 1
@@ -0,0 +1,60 @@
+import asyncio
+
+from projet.auth.lockout import LoginLockout, MemoryAttempts
+
+
+def test_memory_attempts_count_and_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("projet.auth.lockout.time.monotonic", lambda: now[0])
+    attempts = MemoryAttempts()
+    assert [attempts.incr("k", ttl=60) for _ in range(3)] == [1, 2, 3]
+    now[0] += 61
+    assert attempts.incr("k", ttl=60) == 1
+    attempts.delete("k")
+    assert attempts.incr("k", ttl=60) == 1
+
+
+def test_memory_attempts_are_bounded():
+    attempts = MemoryAttempts(max_entries=2)
+    for key in ("a", "b", "c"):
+        attempts.incr(key, ttl=60)
+    assert list(attempts._entries) == ["b", "c"]
+
+
+def test_lockout_falls_back_to_memory_when_redis_fails():
+    class BrokenRedis:
+        def pipeline(self, transaction=True):
+            raise ConnectionError("redis down")
+
+        async def delete(self, key):
+            raise ConnectionError("redis down")
+
+    lockout = LoginLockout(max_attempts=3, window_seconds=60)
+    lockout.use_redis(BrokenRedis())
+
+    async def scenario():
+        counts = [await lockout.register_failure("User@Test.com") for _ in range(2)]
+        await lockout.reset("user@test.com")
+        counts.append(await lockout.register_failure("user@test.com"))
+        return counts
+
+    assert asyncio.run(scenario()) == [1, 2, 1]
+    assert lockout.redis_errors == 4
+
+
+def test_redis_failure_warning_is_rate_limited(caplog):
+    class DownRedis:
+        def pipeline(self, transaction=True):
+            raise ConnectionError("down")
+
+    lockout = LoginLockout(max_attempts=100, window_seconds=60)
+    lockout.use_redis(DownRedis())
+
+    async def run():
+        for _ in range(5):
+            await lockout.register_failure("burst@test.com")
+
+    with caplog.at_level("WARNING", logger="projet.auth.lockout"):
+        asyncio.run(run())
+    assert lockout.redis_errors == 5
+    assert len([r for r in caplog.records if "Redis indisponible" in r.getMessage()]) == 1
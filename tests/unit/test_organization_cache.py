@@ -0,0 +1,32 @@
+from projet.app.organization_cache import OrganizationCache, resolve_active_organization
+
+ORGS = [{"id": "o1", "name": "Espace perso"}, {"id": "o2", "name": "Équipe"}]
+
+
+def test_hit_miss_and_invalidate():
+    cache = OrganizationCache(max_entries=10, ttl=30)
+    assert cache.get(1) is None
+    cache.set(1, ORGS)
+    assert cache.get(1) == ORGS
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_lru_eviction_and_disabled():
+    cache = OrganizationCache(max_entries=2, ttl=30)
+    for user_id in (1, 2, 3):
+        cache.set(user_id, ORGS)
+    assert cache.get(1) is None
+    assert cache.stats()["evictions"] == 1
+
+    disabled = OrganizationCache(max_entries=10, ttl=0)
+    disabled.set(1, ORGS)
+    assert disabled.get(1) is None
+
+
+def test_resolve_active_organization_matches_auth_rule():
+    assert resolve_active_organization(ORGS, "o2")["id"] == "o2"
+    assert resolve_active_organization(ORGS, "inconnue")["id"] == "o1"
+    assert resolve_active_organization(ORGS, None)["id"] == "o1"
+    assert resolve_active_organization([], "o1") is None
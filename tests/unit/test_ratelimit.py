@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from projet.auth.ratelimit import AuthRateLimiter, Limit, LocalTokenBuckets, parse_networks
+
+
+def _request(ip: str) -> Request:
+    return Request({"type": "http", "client": (ip, 1234), "headers": []})
+
+
+def test_limit_parse():
+    assert Limit.parse("5/300") == Limit(5, 300)
+    assert Limit.parse("") is None
+    assert Limit.parse("0") is None
+
+
+def test_token_bucket_refills(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("projet.auth.ratelimit.time.monotonic", lambda: now[0])
+    buckets = LocalTokenBuckets(shards=4)
+    limit = Limit(2, 10)  # 1 jeton toutes les 5 s
+    assert buckets.hit("k", limit) == 0
+    assert buckets.hit("k", limit) == 0
+    assert buckets.hit("k", limit) == pytest.approx(5.0)
+    now[0] += 5
+    assert buckets.hit("k", limit) == 0
+
+
+def test_token_bucket_memory_is_bounded():
+    buckets = LocalTokenBuckets(shards=1, max_keys=10)
+    for i in range(100):
+        buckets.hit(f"ip-{i}", Limit(1, 60))
+    assert len(buckets) == 10
+    assert buckets.evictions == 90
+
+
+def test_limiter_applies_ip_and_account_limits():
+    limiter = AuthRateLimiter(
+        enabled=True,
+        rules={"login": (Limit(3, 60), Limit(2, 60))},
+        local=LocalTokenBuckets(),
+    )
+
+    async def scenario():
+        await limiter.check_account("login", "a@test.com")
+        await limiter.check_account("login", "A@test.com ")
+        with pytest.raises(HTTPException) as exc:
+            await limiter.check_account("login", "a@test.com")
+        assert exc.value.status_code == 429
+        assert int(exc.value.headers["Retry-After"]) >= 1
+
+        for _ in range(3):
+            await limiter.check_ip(_request("10.0.0.1"), "login")
+        with pytest.raises(HTTPException):
+            await limiter.check_ip(_request("10.0.0.1"), "login")
+        await limiter.check_ip(_request("10.0.0.2"), "login")
+        # Scope sans règle: jamais limité
+        await limiter.check_ip(_request("10.0.0.1"), "unknown")
+
+    asyncio.run(scenario())
+    assert limiter.rejected == 2
+
+
+def _proxied(peer: str, forwarded: str | None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+
+def test_forwarded_ip_read_only_from_trusted_proxies():
+    limiter = AuthRateLimiter(
+        enabled=True,
+        rules={},
+        local=LocalTokenBuckets(),
+        trusted_proxies=parse_networks("172.28.0.250, 10.0.0.0/8"),
+    )
+    # L'app web transmet l'IP du navigateur
+    assert limiter.client_ip(_proxied("172.28.0.250", "203.0.113.7")) == "203.0.113.7"
+    # Saut de confiance supplémentaire à droite: ignoré
+    assert limiter.client_ip(_proxied("172.28.0.250", "198.51.100.1, 203.0.113.7, 10.1.2.3")) == "203.0.113.7"
+    # Client direct non fiable: l'en-tête forgé est ignoré
+    assert limiter.client_ip(_proxied("198.51.100.9", "1.2.3.4")) == "198.51.100.9"
+    assert limiter.client_ip(_proxied("172.28.0.250", None)) == "172.28.0.250"
+
+
+def test_browsers_behind_the_web_app_have_separate_ip_limits():
+    limiter = AuthRateLimiter(
+        enabled=True,
+        rules={"register": (Limit(1, 60), None)},
+        local=LocalTokenBuckets(),
+        trusted_proxies=parse_networks("172.28.0.250"),
+    )
+
+    async def run():
+        await limiter.check_ip(_proxied("172.28.0.250", "203.0.113.1"), "register")
+        await limiter.check_ip(_proxied("172.28.0.250", "203.0.113.2"), "register")
+        with pytest.raises(HTTPException):
+            await limiter.check_ip(_proxied("172.28.0.250", "203.0.113.1"), "register")
+
+    asyncio.run(run())
+
+
+def test_redis_failure_warning_is_rate_limited(caplog):
+    class DownRedis:
+        def pipeline(self, transaction=True):
+            raise ConnectionError("down")
+
+    limiter = AuthRateLimiter(enabled=True, rules={"login": (Limit(100, 60), None)}, local=LocalTokenBuckets())
+    limiter.use_redis(DownRedis())
+
+    async def run():
+        for i in range(5):
+            await limiter.check_ip(_request(f"10.0.0.{i}"), "login")
+
+    with caplog.at_level("WARNING", logger="projet.auth.ratelimit"):
+        asyncio.run(run())
+    assert limiter.redis_errors == 5
+    assert len([r for r in caplog.records if "Redis indisponible" in r.getMessage()]) == 1
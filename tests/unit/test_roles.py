@@ -0,0 +1,55 @@
+from sqlalchemy import event
+
+from projet.auth import models, roles
+from projet.auth.database import engine
+from projet.auth.roles import RoleCache
+
+
+def _count_queries():
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", listener)
+
+
+def test_role_resolution_is_served_from_cache(db_session):
+    db_session.add_all([models.Role(name="user"), models.Role(name="admin")])
+    db_session.commit()
+    cache = RoleCache(check_interval=3600)
+    user_id = cache.role_id(db_session, "user")
+    admin_id = cache.role_id(db_session, "admin")
+
+    statements, stop = _count_queries()
+    try:
+        assert cache.role_id(db_session, "user") == user_id
+        assert cache.role_names(db_session, [admin_id, user_id]) == ["admin", "user"]
+    finally:
+        stop()
+    assert statements == []
+    assert cache.loads == 1
+
+
+def test_unknown_role_triggers_reload(db_session):
+    cache = RoleCache(check_interval=3600)
+    assert cache.role_id(db_session, "user") is None
+    db_session.add(models.Role(name="user"))
+    db_session.commit()
+    assert cache.role_id(db_session, "user") is not None
+
+
+def test_version_bump_invalidates_other_processes(db_session):
+    role = models.Role(name="user")
+    db_session.add(role)
+    db_session.commit()
+    cache = RoleCache(check_interval=0)  # vérifie la version à chaque appel
+    assert cache.role_names(db_session, [role.id]) == ["user"]
+
+    # Un script d'admin renomme le rôle et incrémente la version
+    role.name = "member"
+    roles.bump_version(db_session)
+    db_session.commit()
+    assert cache.role_names(db_session, [role.id]) == ["member"]
+    assert cache.loads == 2
@@ -7,3 +7,73 @@ def test_password_hash_and_verify():
     assert h != raw
     assert verify_password(raw, h)
     assert not verify_password("Wrong123!", h)
+
+
+def _write_rsa_keypair(directory, name):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path = directory / f"{name}_private.pem"
+    public_path = directory / f"{name}_public.pem"
+    private_path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    public_path.write_bytes(key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ))
+    return str(private_path), str(public_path)
+
+
+def _use_rs256(monkeypatch, private_path, public_path, extra=None):
+    from projet.auth import tokens
+
+    monkeypatch.setattr(tokens, "ALGORITHM", "RS256")
+    monkeypatch.setattr(tokens.settings, "PRIVATE_KEY_PATH", private_path)
+    monkeypatch.setattr(tokens.settings, "PUBLIC_KEY_PATH", public_path)
+    monkeypatch.setattr(tokens.settings, "JWT_EXTRA_PUBLIC_KEY_PATHS", extra)
+    tokens.reload_keys()
+
+
+def test_rs256_keys_are_parsed_once(monkeypatch, tmp_path):
+    from projet.auth import security, tokens
+
+    private_path, public_path = _write_rsa_keypair(tmp_path, "k1")
+    _use_rs256(monkeypatch, private_path, public_path)
+    reads = []
+    original = tokens._read_file
+    monkeypatch.setattr(tokens, "_read_file", lambda p: reads.append(p) or original(p))
+    try:
+        for _ in range(5):
+            token = security.create_access_token("1")
+            assert security.decode_token(token)["sub"] == "1"
+        assert sorted(reads) == sorted([private_path, public_path])
+    finally:
+        security.reload_keys()
+
+
+def test_rs256_rotation_by_kid(monkeypatch, tmp_path):
+    import pytest
+    from jwt.exceptions import InvalidTokenError
+    from projet.auth import security
+
+    old_private, old_public = _write_rsa_keypair(tmp_path, "old")
+    new_private, new_public = _write_rsa_keypair(tmp_path, "new")
+    try:
+        _use_rs256(monkeypatch, old_private, old_public)
+        old_token = security.create_access_token("1")
+
+        # Nouvelle clé de signature, l'ancienne clé publique reste acceptée
+        _use_rs256(monkeypatch, new_private, new_public, extra=old_public)
+        assert security.decode_token(old_token)["sub"] == "1"
+        assert security.decode_token(security.create_access_token("2"))["sub"] == "2"
+
+        # Ancienne clé retirée => token refusé
+        _use_rs256(monkeypatch, new_private, new_public)
+        with pytest.raises(InvalidTokenError):
+            security.decode_token(old_token)
+    finally:
+        security.reload_keys()
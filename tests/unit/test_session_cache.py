@@ -0,0 +1,55 @@
+import time
+
+import jwt
+
+from projet.app.session_cache import SessionCache
+
+
+def _token(sub: str = "1", exp_in: int = 3600) -> str:
+    return jwt.encode({"sub": sub, "exp": int(time.time()) + exp_in}, "x" * 32, algorithm="HS256")
+
+
+def test_hit_and_miss_counters():
+    cache = SessionCache(max_entries=10, ttl=60)
+    token = _token()
+    assert cache.get(token) is None
+    cache.set(token, {"id": 1, "email": "a@test.com"})
+    assert cache.get(token) == {"id": 1, "email": "a@test.com"}
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["size"] == 1
+
+
+def test_token_without_exp_is_not_cached():
+    cache = SessionCache(max_entries=10, ttl=60)
+    cache.set("fake-token", {"id": 1})
+    assert cache.get("fake-token") is None
+
+
+def test_entry_bounded_by_jwt_exp():
+    cache = SessionCache(max_entries=10, ttl=60)
+    token = _token(exp_in=-1)
+    cache.set(token, {"id": 1})
+    assert cache.get(token) is None
+
+
+def test_lru_eviction():
+    cache = SessionCache(max_entries=2, ttl=60)
+    t1, t2, t3 = _token("1"), _token("2"), _token("3")
+    cache.set(t1, {"id": 1})
+    cache.set(t2, {"id": 2})
+    cache.get(t1)  # t1 devient le plus récent
+    cache.set(t3, {"id": 3})
+    assert cache.get(t2) is None
+    assert cache.get(t1) == {"id": 1}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_and_invalidate_user():
+    cache = SessionCache(max_entries=10, ttl=60)
+    t1, t2 = _token("1"), _token("1", exp_in=1800)
+    cache.set(t1, {"id": 1})
+    cache.set(t2, {"id": 1})
+    cache.invalidate(t1)
+    assert cache.get(t1) is None
+    cache.invalidate_user(1)
+    assert cache.get(t2) is None
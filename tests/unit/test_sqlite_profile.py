@@ -0,0 +1,64 @@
+import threading
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from projet.auth import models
+from projet.auth.database import Base
+from projet.auth.sqlite_profile import apply_sqlite_profile
+
+
+def _profiled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/profile.db", connect_args={"check_same_thread": False})
+    factory = sessionmaker(bind=engine, autoflush=False)
+    serializer = apply_sqlite_profile(engine, factory)
+    Base.metadata.create_all(bind=engine)
+    return engine, factory, serializer
+
+
+def test_pragmas_applied_on_connect(tmp_path):
+    engine, _, _ = _profiled(tmp_path)
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    finally:
+        engine.dispose()
+
+
+def test_writes_are_serialized_and_lock_released(tmp_path):
+    engine, factory, serializer = _profiled(tmp_path)
+    try:
+        errors = []
+
+        def signup(i):
+            db = factory()
+            try:
+                db.add(models.User(email=f"w{i}@test.com", hashed_password="h"))
+                db.commit()
+            except Exception as e:  # pragma: no cover - remonté par l'assert
+                errors.append(e)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=signup, args=(i,)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert serializer.acquisitions == 16
+        db = factory()
+        try:
+            assert db.query(models.User).count() == 16
+            # Session abandonnée après un flush: le verrou doit être rendu au close()
+            db.add(models.User(email="abandoned@test.com", hashed_password="h"))
+            db.flush()
+        finally:
+            db.close()
+        assert serializer._lock.acquire(timeout=1)
+        serializer._lock.release()
+    finally:
+        engine.dispose()
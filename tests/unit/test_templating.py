@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+from projet.app.templating import build_templates, precompile_templates, template_response_factory
+
+
+def _write_templates(directory):
+    (directory / "base.html").write_text("<title>{% block title %}{% endblock %}</title>")
+    (directory / "page.html").write_text('{% extends "base.html" %}{% block title %}{{ name }}{% endblock %}')
+
+
+def test_precompile_fills_bytecode_cache(tmp_path):
+    src, cache = tmp_path / "templates", tmp_path / "cache"
+    src.mkdir()
+    _write_templates(src)
+
+    assert precompile_templates(build_templates(str(src), bytecode_cache_dir=str(cache))) == 2
+    assert len(list(cache.iterdir())) == 2
+
+    # Un nouveau worker charge le bytecode au lieu de recompiler
+    cold = build_templates(str(src), bytecode_cache_dir=str(cache), auto_reload=False)
+    compiled = []
+    original = cold.env.compile
+    cold.env.compile = lambda *args, **kwargs: compiled.append(args) or original(*args, **kwargs)
+    assert cold.env.get_template("page.html").render(name="Projets") == "<title>Projets</title>"
+    assert compiled == []
+    assert cold.env.auto_reload is False
+
+
+def test_signature_resolved_once_for_current_starlette(tmp_path):
+    _write_templates(tmp_path)
+    templates = build_templates(str(tmp_path), bytecode_cache_dir=None)
+    render = template_response_factory(templates)
+    request = SimpleNamespace(scope={"type": "http"})
+    response = render("page.html", request, {"request": request, "name": "Accueil"})
+    assert response.body == b"<title>Accueil</title>"
+
+
+def test_legacy_signature_without_request():
+    calls = []
+
+    class LegacyTemplates:
+        def TemplateResponse(self, name, context, status_code=200):
+            calls.append((name, context, status_code))
+            return "ok"
+
+    render = template_response_factory(LegacyTemplates())
+    assert render("page.html", "req", {"request": "req"}, status_code=201) == "ok"
+    assert calls == [("page.html", {"request": "req"}, 201)]
+
+
+def test_stream_template_sends_shell_before_slot_data(tmp_path):
+    import asyncio
+
+    from projet.app.templating import stream_template
+
+    _write_templates(tmp_path)
+    (tmp_path / "list.html").write_text('<ul id="list">{{ stream_slot("items") }}</ul><footer>{{ name }}</footer>')
+    (tmp_path / "items.html").write_text("{% for item in items %}<li>{{ item }}</li>{% endfor %}")
+    templates = build_templates(str(tmp_path), bytecode_cache_dir=None)
+
+    async def run():
+        ready = asyncio.Event()
+
+        async def items() -> dict:
+            await ready.wait()
+            return {"items": ["a", "<b>"]}
+
+        stream = stream_template(templates, "list.html", {"name": "pied"}, {"items": ("items.html", items())})
+        first = await stream.__anext__()
+        ready.set()
+        rest = [chunk async for chunk in stream]
+        return first, rest
+
+    first, rest = asyncio.run(run())
+    assert first == '<ul id="list">'
+    assert "".join(rest) == "<li>a</li><li>&lt;b&gt;</li></ul><footer>pied</footer>"
+
+
+def test_stream_template_cancels_unconsumed_slots(tmp_path):
+    import asyncio
+
+    from projet.app.templating import stream_template
+
+    (tmp_path / "list.html").write_text('<ul id="list">{{ stream_slot("items") }}</ul>')
+    (tmp_path / "items.html").write_text("{{ items }}")
+    templates = build_templates(str(tmp_path), bytecode_cache_dir=None)
+    cancelled = []
+
+    async def run():
+        async def items() -> dict:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append("items")
+                raise
+            return {"items": []}
+
+        stream = stream_template(templates, "list.html", {}, {"items": ("items.html", items())})
+        await stream.__anext__()
+        await asyncio.sleep(0)
+        # Client déconnecté avant la zone: le flux est fermé sans être consommé
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert cancelled == ["items"]
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from projet.auth import models
+from projet.auth.token_maintenance import purge_refresh_tokens
+
+
+def test_purge_deletes_expired_in_batches_and_keeps_unexpired_revoked(db_session):
+    now = datetime(2026, 6, 1, 12, 0)
+    user = models.User(email="purge@test.com", hashed_password="h")
+    db_session.add(user)
+    db_session.commit()
+
+    def token(name, expires_in, revoked=False, age=timedelta(0)):
+        return models.RefreshToken(
+            token_hash=name,
+            user_id=user.id,
+            expires_at=now + expires_in,
+            created_at=now - age,
+            is_revoked=revoked,
+        )
+
+    db_session.add_all(
+        [token(f"expired-{i}", -timedelta(days=1)) for i in range(5)]
+        + [
+            token("active", timedelta(days=3)),
+            token("revoked-recent", timedelta(days=3), revoked=True, age=timedelta(hours=1)),
+            token("revoked-old", timedelta(days=3), revoked=True, age=timedelta(days=2)),
+        ]
+    )
+    db_session.commit()
+
+    assert purge_refresh_tokens(batch_size=2, now=now, max_batches=1) == 2
+    assert purge_refresh_tokens(batch_size=2, now=now) == 3
+    db_session.expire_all()
+    remaining = {t.token_hash for t in db_session.query(models.RefreshToken)}
+    # Révoqué mais pas expiré: conservé pour détecter un rejeu
+    assert remaining == {"active", "revoked-recent", "revoked-old"}
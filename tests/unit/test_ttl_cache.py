@@ -0,0 +1,17 @@
+from projet.app.ttl_cache import TTLCache
+
+
+def test_entries_expire_and_ttl_is_capped(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("projet.app.ttl_cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(max_entries=10, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+    cache.set("c", 3, ttl=3600)  # plafonné à `ttl`
+    cache.set("d", 4, ttl=0)
+    now[0] += 10
+    assert cache.get("a") == 1 and cache.get("b") is None
+    assert cache.get("d") is None
+    now[0] += 25
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 4, "evictions": 0}
@@ -0,0 +1,49 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from projet.app.upstream import UpstreamBatch
+
+
+def _client(delay: float = 0.0):
+    response = Mock()
+    response.status_code = 200
+
+    async def fake_get(url, headers=None):
+        await asyncio.sleep(delay)
+        return response
+
+    client = Mock()
+    client.get = AsyncMock(side_effect=fake_get)
+    return client, response
+
+
+def test_identical_gets_are_deduplicated():
+    client, response = _client()
+    batch = UpstreamBatch(client)
+
+    async def run():
+        return await asyncio.gather(
+            batch.get("http://auth/me", headers={"Authorization": "Bearer t"}),
+            batch.get("http://auth/me", headers={"Authorization": "Bearer t"}),
+            batch.get("http://auth/auth/organizations", headers={"Authorization": "Bearer t"}),
+        )
+
+    results = asyncio.run(run())
+    assert results == [response, response, response]
+    assert client.get.await_count == 2
+
+
+def test_calls_run_concurrently_and_are_timed():
+    client, _ = _client(delay=0.05)
+    batch = UpstreamBatch(client)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(batch.get("http://auth/me"), batch.get("http://auth/auth/projects"))
+        return loop.time() - start
+
+    elapsed = asyncio.run(run())
+    assert elapsed < 0.09
+    assert sorted(desc for desc, _ in batch.timings) == ["GET /auth/projects", "GET /me"]
+    assert batch.server_timing().count("upstream;desc=") == 2
@@ -22,3 +22,33 @@ def test_get_token_from_cookie_absent():
     scope = {"type": "http", "headers": []}
     request = Request(scope)
     assert get_token_from_cookie(request) is None
+
+
+def test_verify_token_locally_returns_claims():
+    from projet.auth import security
+    from projet.app.web import verify_token_locally
+
+    token = security.create_access_token("42", roles=["user"], email="local@test.com")
+    assert verify_token_locally(token) == {"id": 42, "email": "local@test.com", "roles": ["user"]}
+
+
+def test_verify_token_locally_rejects_invalid_and_refresh_tokens():
+    from projet.auth import security
+    from projet.app.web import verify_token_locally
+
+    assert verify_token_locally("fake-token") is None
+    assert verify_token_locally(security.create_refresh_token("42")) is None
+
+
+def test_web_app_does_not_import_the_auth_database():
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, projet.app.web; "
+        "sys.exit('projet.auth.database' in sys.modules or 'sqlalchemy' in sys.modules)"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, ["src", os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr